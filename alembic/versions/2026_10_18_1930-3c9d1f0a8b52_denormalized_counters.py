@@ -0,0 +1,48 @@
+"""denormalized counters
+
+Revision ID: 3c9d1f0a8b52
+Revises: 777522f8ac14
+Create Date: 2026-10-18 19:30:12.418203
+
+"""
+from typing import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+from settings.models.counters import COUNTER_DDL, RECOUNT_MENUS, RECOUNT_SUBMENUS
+
+# revision identifiers, used by Alembic.
+revision: str = '3c9d1f0a8b52'
+down_revision: str | None = '777522f8ac14'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'menu',
+        sa.Column('submenus_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'menu',
+        sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    op.add_column(
+        'submenu',
+        sa.Column('dishes_count', sa.Integer(), server_default='0', nullable=False),
+    )
+    for statement in COUNTER_DDL:
+        op.execute(statement)
+    # Заполнение счетчиков для уже существующих данных
+    op.execute(RECOUNT_SUBMENUS)
+    op.execute(RECOUNT_MENUS)
+
+
+def downgrade() -> None:
+    for table in ('dish', 'submenu'):
+        for event_name in ('insert', 'update', 'delete'):
+            op.execute(f'DROP TRIGGER IF EXISTS {table}_counters_{event_name} ON {table}')
+        op.execute(f'DROP FUNCTION IF EXISTS {table}_counters()')
+    op.drop_column('submenu', 'dishes_count')
+    op.drop_column('menu', 'dishes_count')
+    op.drop_column('menu', 'submenus_count')
@@ -0,0 +1,24 @@
+"""many submenus per menu
+
+Revision ID: 5e1b7c2d9a40
+Revises: 3c9d1f0a8b52
+Create Date: 2026-10-18 20:10:41.902117
+
+"""
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1b7c2d9a40'
+down_revision: str | None = '3c9d1f0a8b52'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.drop_constraint('submenu_menu_id_key', 'submenu', type_='unique')
+
+
+def downgrade() -> None:
+    op.create_unique_constraint('submenu_menu_id_key', 'submenu', ['menu_id'])
@@ -0,0 +1,26 @@
+"""parent indexes
+
+Revision ID: 8a4f2e6b1c93
+Revises: 5e1b7c2d9a40
+Create Date: 2026-10-18 20:45:03.117254
+
+"""
+from typing import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8a4f2e6b1c93'
+down_revision: str | None = '5e1b7c2d9a40'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_submenu_menu_id_id', 'submenu', ['menu_id', 'id'])
+    op.create_index('ix_dish_submenu_id_id', 'dish', ['submenu_id', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dish_submenu_id_id', table_name='dish')
+    op.drop_index('ix_submenu_menu_id_id', table_name='submenu')
@@ -1,30 +1,36 @@
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from api.v1.dishes.schemas import DishIn, DishOut
-from settings.models import Dish
-from sqlalchemy import delete, insert, select, update
+from settings.models import Dish, SubMenu
+from sqlalchemy import cast, column, delete, insert, literal, select, update, values
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 async def add_dish(
-    data: DishIn, session: AsyncSession, submenu_id: UUID
-) -> dict[str, Any]:
+    data: DishIn, session: AsyncSession, menu_id: UUID, submenu_id: UUID
+) -> dict[str, Any] | None:
     """
-    Функция добавления записи в таблицу Dish
+    Функция добавления записи в таблицу Dish. INSERT ... SELECT вставляет
+    блюдо, только если подменю есть и принадлежит меню
     :param data:
     :param session:
+    :param menu_id:
     :param submenu_id:
-    :return: answer
+    :return: answer или None, если подменю не найдено
     """
+    row = select(
+        literal(uuid4(), Dish.id.type),
+        literal(data.title, Dish.title.type),
+        literal(data.description, Dish.description.type),
+        literal(data.price, Dish.price.type),
+        SubMenu.id,
+        literal(data.discount, Dish.discount.type),
+    ).where(SubMenu.id == submenu_id, SubMenu.menu_id == menu_id)
     stmt = (
         insert(Dish)
-        .values(
-            title=data.title,
-            description=data.description,
-            price=data.price,
-            submenu_id=submenu_id,
-            discount=data.discount,
+        .from_select(
+            ['id', 'title', 'description', 'price', 'submenu_id', 'discount'], row
         )
         .returning(
             Dish.id,
@@ -36,7 +42,60 @@ async def add_dish(
         )
     )
     result = await session.execute(stmt)
-    answer = result.first()._asdict()
+    answer = result.first()
+    await session.commit()
+    return answer._asdict() if answer else None
+
+
+async def add_dishes(
+    data: list[DishIn], session: AsyncSession, menu_id: UUID, submenu_id: UUID
+) -> list[dict[str, Any]]:
+    """
+    Функция добавления пачки записей в таблицу Dish одним INSERT ... SELECT
+    из VALUES. Триггеры счетчиков срабатывают один раз на всю пачку
+    :param data:
+    :param session:
+    :param menu_id:
+    :param submenu_id:
+    :return: answer, пустой список, если подменю не найдено
+    """
+    rows = values(
+        column('id', Dish.id.type),
+        column('title', Dish.title.type),
+        column('description', Dish.description.type),
+        column('price', Dish.price.type),
+        column('discount', Dish.discount.type),
+        name='rows',
+    ).data(
+        [(uuid4(), dish.title, dish.description, dish.price, dish.discount) for dish in data]
+    )
+    stmt = (
+        insert(Dish)
+        .from_select(
+            ['id', 'title', 'description', 'price', 'discount', 'submenu_id'],
+            # NULL в VALUES без типа Postgres считает text
+            select(
+                rows.c.id,
+                rows.c.title,
+                cast(rows.c.description, Dish.description.type),
+                rows.c.price,
+                cast(rows.c.discount, Dish.discount.type),
+                SubMenu.id,
+            ).where(
+                SubMenu.id == submenu_id, SubMenu.menu_id == menu_id
+            ),
+        )
+        .returning(
+            Dish.id,
+            Dish.title,
+            Dish.description,
+            Dish.price,
+            Dish.submenu_id,
+            Dish.discount,
+        )
+    )
+    result = await session.execute(stmt)
+    answer = [dish._asdict() for dish in result]
     await session.commit()
     return answer
 
@@ -54,13 +113,21 @@ async def show_dish(title: UUID, session: AsyncSession) -> DishOut | None:
     return answer
 
 
-async def get_all_dish(session: AsyncSession) -> list[Dish]:
+async def get_all_dish(
+    submenu_id: UUID, session: AsyncSession, limit: int, after: UUID | None = None
+) -> list[Dish]:
     """
-    Функция возвращает список блюд
+    Функция возвращает страницу блюд подменю по возрастанию id
+    :param submenu_id:
     :param session:
+    :param limit: размер страницы
+    :param after: id последнего блюда предыдущей страницы
     :return: list(answer)
     """
-    stmt = select(Dish).order_by(Dish.id)
+    stmt = select(Dish).where(Dish.submenu_id == submenu_id)
+    if after is not None:
+        stmt = stmt.where(Dish.id > after)
+    stmt = stmt.order_by(Dish.id).limit(limit)
     result = await session.execute(stmt)
     answer = result.scalars().all()
     return list(answer)
@@ -68,13 +135,13 @@ async def get_all_dish(session: AsyncSession) -> list[Dish]:
 
 async def change_dish(
     dish_id: UUID, data: DishIn, session: AsyncSession
-) -> dict[str, Any]:
+) -> dict[str, Any] | None:
     """
     Функция внесения изменения в запись таблицы Dish
     :param dish_id:
     :param data:
     :param session:
-    :return: answer
+    :return: answer или None, если блюда нет
     """
     stmt = (
         update(Dish)
@@ -95,23 +162,24 @@ async def change_dish(
         )
     )
     result = await session.execute(stmt)
-    answer = result.first()._asdict()
+    answer = result.first()
     await session.commit()
-    return answer
+    return answer._asdict() if answer else None
 
 
-async def drop_dish(dish_id: UUID, session: AsyncSession) -> dict[str, str | bool]:
+async def drop_dish(
+    dish_id: UUID, session: AsyncSession
+) -> dict[str, str | bool] | None:
     """
     Функция удаления записи из таблицы Dish
     :param dish_id:
     :param session:
-    :return: dict
+    :return: dict или None, если блюда нет
     """
-    stmt = (
-        delete(Dish)
-        .where(Dish.id == dish_id)
-        .returning(Dish.id, Dish.title, Dish.description, Dish.price, Dish.discount)
-    )
-    await session.execute(stmt)
+    stmt = delete(Dish).where(Dish.id == dish_id).returning(Dish.id)
+    result = await session.execute(stmt)
+    deleted = result.first()
     await session.commit()
+    if deleted is None:
+        return None
     return {'status': True, 'message': 'The menu has been deleted'}
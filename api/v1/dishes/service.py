@@ -1,12 +1,21 @@
 from typing import Any
 from uuid import UUID
 
-from api.v1.dishes.crud import add_dish, change_dish, drop_dish, get_all_dish, show_dish
+from api.v1.dishes.crud import (
+    add_dish,
+    add_dishes,
+    change_dish,
+    drop_dish,
+    get_all_dish,
+    show_dish,
+)
 from api.v1.dishes.schemas import DishIn, DishOut
 from asyncpg import UniqueViolationError
 from fastapi import BackgroundTasks
 from settings.cache import redis_cache
-from settings.models import Dish, Menu, SubMenu
+from settings.codec import schema_render
+from settings.config import PAGE_SIZE
+from settings.models import Menu
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.exceptions import (
@@ -17,6 +26,9 @@ from utils.exceptions import (
 )
 from utils.utils import data_finder
 
+render_dish = schema_render(DishOut)
+render_dishes = schema_render(list[DishOut])
+
 
 class DishService:
     def __init__(self) -> None:
@@ -30,55 +42,101 @@ class DishService:
         submenu_id: UUID,
         background_task: BackgroundTasks,
     ) -> dict[str, Any]:
-        if await data_finder(table=Menu, table_id=menu_id, session=session):
-            if await data_finder(table=SubMenu, table_id=submenu_id, session=session):
-                try:
-                    answer = await add_dish(
-                        data=data, submenu_id=submenu_id, session=session
-                    )
-                    await self.cacher.create_dish_cache(
-                        menu_id=menu_id, submenu_id=submenu_id, item=answer
-                    )
-                    background_task.add_task(
-                        self.cacher.create_dish_cache, answer, menu_id, submenu_id
-                    )
-                    return answer
-                except (UniqueViolationError, IntegrityError):
-                    raise DishAlreadyExists
-            raise SubMenuNotFound
-        raise MenuNotFound
+        try:
+            answer = await add_dish(
+                data=data, menu_id=menu_id, submenu_id=submenu_id, session=session
+            )
+        except (UniqueViolationError, IntegrityError):
+            raise DishAlreadyExists
+        if answer is None:
+            if await data_finder(table=Menu, table_id=menu_id, session=session):
+                raise SubMenuNotFound
+            raise MenuNotFound
+        await self.cacher.create_dish_cache(
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            item=answer,
+            render=render_dish,
+        )
+        background_task.add_task(
+            self.cacher.create_dish_cache,
+            item=answer,
+            submenu_id=submenu_id,
+            menu_id=menu_id,
+            render=render_dish,
+        )
+        return answer
 
-    async def get_dish_service(
+    async def create_dishes_service(
         self,
         menu_id: UUID,
-        submenu_id: UUID,
-        title: UUID,
+        data: list[DishIn],
         session: AsyncSession,
+        submenu_id: UUID,
         background_task: BackgroundTasks,
-    ) -> DishOut | None:
-        answer = await show_dish(title=title, session=session)
+    ) -> list[dict[str, Any]]:
+        try:
+            answer = await add_dishes(
+                data=data, menu_id=menu_id, submenu_id=submenu_id, session=session
+            )
+        except (UniqueViolationError, IntegrityError):
+            raise DishAlreadyExists
         if not answer:
-            raise DishNotFound
-        await self.cacher.get_dish_cache(
-            menu_id=menu_id, submenu_id=submenu_id, dish_id=title
+            if await data_finder(table=Menu, table_id=menu_id, session=session):
+                raise SubMenuNotFound
+            raise MenuNotFound
+        await self.cacher.create_dishes_cache(
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            items=answer,
+            render=render_dish,
         )
         background_task.add_task(
-            self.cacher.get_dish_cache, answer, submenu_id, menu_id
+            self.cacher.create_dishes_cache,
+            items=answer,
+            submenu_id=submenu_id,
+            menu_id=menu_id,
+            render=render_dish,
         )
         return answer
 
-    async def get_all_dish_service(
+    async def get_dish_service(
         self,
         menu_id: UUID,
         submenu_id: UUID,
+        title: UUID,
         session: AsyncSession,
-        background_task: BackgroundTasks,
-    ) -> list[Dish]:
-        answer = await get_all_dish(session=session)
-        await self.cacher.get_all_dishes_cache(menu_id=menu_id, submenu_id=submenu_id)
-        background_task.add_task(self.cacher.get_all_dishes_cache, answer, submenu_id)
+    ) -> bytes:
+        answer = await self.cacher.get_dish_cache(
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            dish_id=title,
+            loader=lambda: show_dish(title=title, session=session),
+            render=render_dish,
+        )
+        if not answer:
+            raise DishNotFound
         return answer
 
+    async def get_all_dish_service(
+        self,
+        menu_id: UUID,
+        submenu_id: UUID,
+        session: AsyncSession,
+        limit: int = PAGE_SIZE,
+        after: UUID | None = None,
+    ) -> bytes:
+        return await self.cacher.get_all_dishes_cache(
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            limit=limit,
+            after=after,
+            loader=lambda: get_all_dish(
+                submenu_id=submenu_id, session=session, limit=limit, after=after
+            ),
+            render=render_dishes,
+        )
+
     async def change_dish_service(
         self,
         menu_id: UUID,
@@ -88,16 +146,20 @@ class DishService:
         session: AsyncSession,
         background_task: BackgroundTasks,
     ) -> dict[str, Any]:
-        if await data_finder(table=Dish, table_id=dish_id, session=session):
-            answer = await change_dish(dish_id=dish_id, data=data, session=session)
-            await self.cacher.update_dish_cache(
-                menu_id=menu_id, submenu_id=submenu_id, item=answer
-            )
-            background_task.add_task(
-                self.cacher.update_dish_cache, answer, submenu_id, menu_id
-            )
-            return answer
-        raise DishNotFound
+        answer = await change_dish(dish_id=dish_id, data=data, session=session)
+        if answer is None:
+            raise DishNotFound
+        await self.cacher.update_dish_cache(
+            menu_id=menu_id, submenu_id=submenu_id, item=answer, render=render_dish
+        )
+        background_task.add_task(
+            self.cacher.update_dish_cache,
+            item=answer,
+            menu_id=menu_id,
+            submenu_id=submenu_id,
+            render=render_dish,
+        )
+        return answer
 
     async def drop_dish_service(
         self,
@@ -106,9 +168,9 @@ class DishService:
         session: AsyncSession,
         background_task: BackgroundTasks,
     ) -> dict[str, str | bool]:
-        if await data_finder(table=Dish, table_id=dish_id, session=session):
-            answer = await drop_dish(dish_id=dish_id, session=session)
-            await self.cacher.delete_dish_cache(menu_id=menu_id)
-            background_task.add_task(self.cacher.delete_dish_cache, answer)
-            return answer
-        raise DishNotFound
+        answer = await drop_dish(dish_id=dish_id, session=session)
+        if answer is None:
+            raise DishNotFound
+        await self.cacher.delete_dish_cache(menu_id=menu_id)
+        background_task.add_task(self.cacher.delete_dish_cache, menu_id=menu_id)
+        return answer
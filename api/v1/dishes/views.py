@@ -3,11 +3,18 @@ from uuid import UUID
 
 from api.v1.dishes.schemas import DishIn, DishOut
 from api.v1.dishes.service import DishService
-from fastapi import APIRouter, BackgroundTasks, Depends, status
-from settings.config import DISH_LINK, DISHES_LINK
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, Response, status
+from settings.config import (
+    BULK_MAX_SIZE,
+    DISH_LINK,
+    DISHES_BULK_LINK,
+    DISHES_LINK,
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+)
 from settings.database import vortex
-from settings.models import Dish
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.utils import json_response
 
 router = APIRouter()
 
@@ -49,6 +56,43 @@ async def create_dish(
     )
 
 
+@router.post(
+    DISHES_BULK_LINK,
+    status_code=status.HTTP_201_CREATED,
+    response_model=list[DishOut],
+    description='Создать несколько блюд одним запросом',
+    summary='Создать несколько блюд',
+    responses={
+        404: {'description': 'submenu not found'},
+        400: {'description': 'Такое блюдо уже есть'},
+    },
+)
+async def create_dishes(
+    menu_id: UUID,
+    submenu_id: UUID,
+    background_task: BackgroundTasks,
+    dishes_in: list[DishIn] = Body(min_length=1, max_length=BULK_MAX_SIZE),
+    session: AsyncSession = Depends(vortex.scoped_session),
+    dish_repo: DishService = Depends(),
+) -> list[dict[str, Any]]:
+    """
+    Эндпоинт создания пачки записей в таблице Dish
+    :param background_task:
+    :param menu_id:
+    :param submenu_id:
+    :param dishes_in:
+    :param session:
+    :param dish_repo:
+    """
+    return await dish_repo.create_dishes_service(
+        submenu_id=submenu_id,
+        data=dishes_in,
+        session=session,
+        menu_id=menu_id,
+        background_task=background_task,
+    )
+
+
 @router.get(
     DISH_LINK,
     response_model=DishOut,
@@ -60,26 +104,24 @@ async def get_dish(
     menu_id: UUID,
     submenu_id,
     dish_id: UUID,
-    background_task: BackgroundTasks,
-    session: AsyncSession = Depends(vortex.scoped_session),
+    session: AsyncSession = Depends(vortex.read_session),
     dish_repo: DishService = Depends(),
-) -> DishOut | None:
+) -> Response:
     """
     Эндпоинт получения записи из таблицы Dish
-    :param background_task:
     :param menu_id:
     :param submenu_id:
     :param dish_id:
     :param session:
     :param dish_repo:
     """
-    return await dish_repo.get_dish_service(
+    answer = await dish_repo.get_dish_service(
         title=dish_id,
         session=session,
         menu_id=menu_id,
         submenu_id=submenu_id,
-        background_task=background_task,
     )
+    return json_response(answer)
 
 
 @router.get(
@@ -92,24 +134,29 @@ async def get_dish(
 async def show_dishes(
     menu_id: UUID,
     submenu_id: UUID,
-    background_task: BackgroundTasks,
-    session: AsyncSession = Depends(vortex.scoped_session),
+    limit: int = Query(default=PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: UUID | None = None,
+    session: AsyncSession = Depends(vortex.read_session),
     dish_repo: DishService = Depends(),
-) -> list[Dish]:
+) -> Response:
     """
-    Эндпоинт получения списка записей в таблице Dish
-    :param background_task:
+    Эндпоинт получения страницы блюд подменю.
+    Следующая страница запрашивается с after = id последнего блюда
     :param menu_id:
     :param submenu_id:
+    :param limit:
+    :param after:
     :param session:
     :param dish_repo:
     """
-    return await dish_repo.get_all_dish_service(
+    answer = await dish_repo.get_all_dish_service(
         session=session,
         menu_id=menu_id,
         submenu_id=submenu_id,
-        background_task=background_task,
+        limit=limit,
+        after=after,
     )
+    return json_response(answer)
 
 
 @router.patch(
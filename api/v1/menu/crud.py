@@ -2,11 +2,46 @@ from typing import Any
 from uuid import UUID
 
 from api.v1.menu.schemas import MenuIn
-from settings.models import Dish, Menu, SubMenu
-from sqlalchemy import Result, delete, distinct, func, insert, select, update
+from settings.models import Menu
+from sqlalchemy import Result, delete, insert, select, text, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-from utils.utils import dishes_count, submenu_count
+
+# Дерево меню -> подменю -> блюда в форме прежнего ответа /all_base
+FULL_BASE_QUERY = """
+SELECT coalesce(json_agg(json_build_object(
+    'id', menu.id,
+    'title', menu.title,
+    'description', menu.description,
+    'submenus_count', menu.submenus_count,
+    'dishes_count', menu.dishes_count,
+    'submenu_link', coalesce(submenus.items, '[]')
+) ORDER BY menu.id), '[]')::text
+FROM menu
+LEFT JOIN LATERAL (
+    SELECT json_agg(json_build_object(
+        'id', submenu.id,
+        'title', submenu.title,
+        'description', submenu.description,
+        'menu_id', submenu.menu_id,
+        'dishes_count', submenu.dishes_count,
+        'dishes', coalesce(dishes.items, '[]')
+    ) ORDER BY submenu.id) AS items
+    FROM submenu
+    LEFT JOIN LATERAL (
+        SELECT json_agg(json_build_object(
+            'id', dish.id,
+            'title', dish.title,
+            'description', dish.description,
+            'price', dish.price,
+            'discount', dish.discount,
+            'submenu_id', dish.submenu_id
+        ) ORDER BY dish.id) AS items
+        FROM dish
+        WHERE dish.submenu_id = submenu.id
+    ) AS dishes ON true
+    WHERE submenu.menu_id = menu.id
+) AS submenus ON true
+"""
 
 
 async def add_menu(session: AsyncSession, data: MenuIn) -> dict[str, Any]:
@@ -19,19 +54,17 @@ async def add_menu(session: AsyncSession, data: MenuIn) -> dict[str, Any]:
     stmt = (
         insert(Menu)
         .values(title=data.title, description=data.description)
-        .returning(Menu.id, Menu.title, Menu.description)
+        .returning(
+            Menu.id,
+            Menu.title,
+            Menu.description,
+            Menu.submenus_count,
+            Menu.dishes_count,
+        )
     )
     result = await session.execute(stmt)
     answer = result.first()._asdict()
     await session.commit()
-    submenus = {
-        'submenus_count': await submenu_count(menu_id=answer['id'], session=session)
-    }
-    dishes = {
-        'dishes_count': await dishes_count(submenu_id=answer['id'], session=session)
-    }
-    answer.update(submenus)
-    answer.update(dishes)
     return answer
 
 
@@ -42,88 +75,87 @@ async def show_menu(title: UUID, session: AsyncSession) -> Menu | None:
     :param session:
     :return: data
     """
-    stmt = (
-        select(
-            Menu.id,
-            Menu.title,
-            Menu.description,
-            func.count(distinct(SubMenu.id)).label('submenus_count'),
-            func.count(distinct(Dish.id)).label('dishes_count'),
-        )
-        .select_from(Menu)
-        .outerjoin(SubMenu, Menu.id == SubMenu.menu_id)
-        .outerjoin(Dish, SubMenu.id == Dish.submenu_id)
-        .where(Menu.id == title)
-        .group_by(Menu.id)
-    )
+    stmt = select(
+        Menu.id,
+        Menu.title,
+        Menu.description,
+        Menu.submenus_count,
+        Menu.dishes_count,
+    ).where(Menu.id == title)
     result: Result = await session.execute(stmt)
     answer: Menu | None = result.one_or_none()
     return answer
 
 
-async def get_all_menus(session: AsyncSession) -> list[Menu]:
+async def get_all_menus(session: AsyncSession) -> list[dict[str, Any]]:
     """
-    Функция возвращает список подменю
+    Функция возвращает список меню с количеством подменю и блюд
     :param session:
-    :return: list(answer)
+    :return: answer
     """
-    stmt = select(Menu).order_by(Menu.id)
+    stmt = select(
+        Menu.id,
+        Menu.title,
+        Menu.description,
+        Menu.submenus_count,
+        Menu.dishes_count,
+    ).order_by(Menu.id)
     result = await session.execute(stmt)
-    answer = result.scalars().all()
-    return list(answer)
+    return [menu._asdict() for menu in result]
 
 
 async def change_menu(
     menu_id: UUID, data: MenuIn, session: AsyncSession
-) -> dict[str, Any]:
+) -> dict[str, Any] | None:
     """
     Функция внесения изменения в запись таблицы Menu
     :param menu_id:
     :param data:
     :param session:
-    :return: answer
+    :return: answer или None, если меню нет
     """
     stmt = (
         update(Menu)
         .where(Menu.id == menu_id)
         .values(title=data.title, description=data.description)
-        .returning(Menu.id, Menu.title, Menu.description)
+        .returning(
+            Menu.id,
+            Menu.title,
+            Menu.description,
+            Menu.submenus_count,
+            Menu.dishes_count,
+        )
     )
     result = await session.execute(stmt)
-    answer = result.first()._asdict()
+    answer = result.first()
     await session.commit()
-    submenus = {
-        'submenus_count': await submenu_count(menu_id=answer['id'], session=session)
-    }
-    dishes = {
-        'dishes_count': await dishes_count(submenu_id=answer['id'], session=session)
-    }
-    answer.update(submenus)
-    answer.update(dishes)
-    return answer
+    return answer._asdict() if answer else None
 
 
-async def drop_menu(menu_id: UUID, session: AsyncSession) -> dict[str, str | bool]:
+async def drop_menu(
+    menu_id: UUID, session: AsyncSession
+) -> dict[str, str | bool] | None:
     """
     Функция удаления записи из таблицы Menu
     :param menu_id:
     :param session:
-    :return: dict
+    :return: dict или None, если меню нет
     """
-    stmt = (
-        delete(Menu)
-        .where(Menu.id == menu_id)
-        .returning(Menu.id, Menu.title, Menu.description)
-    )
-    await session.execute(stmt)
+    stmt = delete(Menu).where(Menu.id == menu_id).returning(Menu.id)
+    result = await session.execute(stmt)
+    deleted = result.first()
     await session.commit()
+    if deleted is None:
+        return None
     return {'status': True, 'message': 'The menu has been deleted'}
 
 
-async def all_menu_data(session: AsyncSession) -> list[Menu]:
-    stmt = select(Menu).options(
-        selectinload(Menu.submenu_link).selectinload(SubMenu.dishes)
-    )
-    result = await session.execute(stmt)
-    answer = result.scalars().all()
-    return list(answer)
+async def all_menu_data(session: AsyncSession) -> bytes:
+    """
+    Функция возвращает все меню с подменю и блюдами готовым JSON,
+    собранным в Postgres одним запросом, без ORM объектов и схем
+    :param session:
+    :return: body
+    """
+    answer: str = await session.scalar(text(FULL_BASE_QUERY))
+    return answer.encode()
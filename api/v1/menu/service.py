@@ -9,15 +9,17 @@ from api.v1.menu.crud import (
     get_all_menus,
     show_menu,
 )
-from api.v1.menu.schemas import MenuIn
+from api.v1.menu.schemas import MenuIn, MenuOut
 from asyncpg import UniqueViolationError
 from fastapi import BackgroundTasks
 from settings.cache import redis_cache
-from settings.models import Menu
+from settings.codec import passthrough, schema_render
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 from utils.exceptions import MenuAlreadyExists, MenuNotFound
-from utils.utils import data_finder
+
+render_menu = schema_render(MenuOut)
+render_menus = schema_render(list[MenuOut])
 
 
 class MenuService:
@@ -29,33 +31,28 @@ class MenuService:
     ) -> dict[str, Any]:
         try:
             answer = await add_menu(data=data, session=session)
-            await self.cacher.create_update_menu_cache(answer)
-            background_task.add_task(self.cacher.create_update_menu_cache, answer)
+            await self.cacher.create_update_menu_cache(answer, render=render_menu)
+            background_task.add_task(
+                self.cacher.create_update_menu_cache, answer, render=render_menu
+            )
             return answer
         except (UniqueViolationError, IntegrityError):
             raise MenuAlreadyExists
 
-    async def get_menu_service(
-        self, title: UUID, session: AsyncSession, background_task: BackgroundTasks
-    ) -> Menu | None:
-        cache = await self.cacher.get_menu_cache(menu_id=title)
-        if cache:
-            return cache
-        answer = await show_menu(title=title, session=session)
+    async def get_menu_service(self, title: UUID, session: AsyncSession) -> bytes:
+        answer = await self.cacher.get_menu_cache(
+            menu_id=title,
+            loader=lambda: show_menu(title=title, session=session),
+            render=render_menu,
+        )
         if not answer:
             raise MenuNotFound
-        background_task.add_task(self.cacher.get_menu_cache, title)
         return answer
 
-    async def get_all_menu_service(
-        self, session: AsyncSession, background_task: BackgroundTasks
-    ) -> list[Menu]:
-        cache = await self.cacher.get_all_menus_cache()
-        if cache:
-            return cache
-        answer = await get_all_menus(session=session)
-        background_task.add_task(self.cacher.get_all_menus_cache)
-        return answer
+    async def get_all_menu_service(self, session: AsyncSession) -> bytes:
+        return await self.cacher.get_all_menus_cache(
+            loader=lambda: get_all_menus(session=session), render=render_menus
+        )
 
     async def change_menu_service(
         self,
@@ -64,29 +61,34 @@ class MenuService:
         session: AsyncSession,
         background_task: BackgroundTasks,
     ) -> dict[str, Any]:
-        if await data_finder(table=Menu, table_id=menu_id, session=session):
-            answer = await change_menu(menu_id=menu_id, data=data, session=session)
-            await self.cacher.create_update_menu_cache(answer)
-            background_task.add_task(self.cacher.create_update_menu_cache, answer)
-            return answer
-        raise MenuNotFound
+        answer = await change_menu(menu_id=menu_id, data=data, session=session)
+        if answer is None:
+            raise MenuNotFound
+        await self.cacher.create_update_menu_cache(answer, render=render_menu)
+        background_task.add_task(
+            self.cacher.create_update_menu_cache, answer, render=render_menu
+        )
+        return answer
 
     async def drop_menu_service(
         self, menu_id: UUID, session: AsyncSession, background_task: BackgroundTasks
     ) -> dict[str, str | bool]:
-        if await data_finder(table=Menu, table_id=menu_id, session=session):
-            answer = await drop_menu(menu_id=menu_id, session=session)
-            await self.cacher.delete_menu_cache(menu_id=menu_id)
-            background_task.add_task(self.cacher.delete_menu_cache, menu_id)
-            return answer
-        raise MenuNotFound
+        answer = await drop_menu(menu_id=menu_id, session=session)
+        if answer is None:
+            raise MenuNotFound
+        await self.cacher.delete_menu_cache(menu_id=menu_id)
+        background_task.add_task(self.cacher.delete_menu_cache, menu_id)
+        return answer
 
     async def get_full_service(
-        self, session: AsyncSession, background_task: BackgroundTasks
-    ) -> list[Menu]:
-        cache = await self.cacher.get_full_base_menu_cache()
-        if cache:
-            return cache
-        answer = await all_menu_data(session=session)
-        background_task.add_task(self.cacher.get_full_base_menu_cache)
-        return answer
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        background_task: BackgroundTasks,
+    ) -> tuple[bytes, bool]:
+        async def loader() -> bytes:
+            async with session_factory() as session:
+                return await all_menu_data(session=session)
+
+        return await self.cacher.get_full_base_menu_cache(
+            loader=loader, background_task=background_task, render=passthrough
+        )
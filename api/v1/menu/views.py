@@ -3,11 +3,11 @@ from uuid import UUID
 
 from api.v1.menu.schemas import MenuIn, MenuOut
 from api.v1.menu.service import MenuService
-from fastapi import APIRouter, BackgroundTasks, Depends, status
-from settings.config import MENU_LINK, MENUS_LINK
+from fastapi import APIRouter, BackgroundTasks, Depends, Response, status
+from settings.config import MENU_LINK, MENUS_LINK, STALE_WARNING
 from settings.database import vortex
-from settings.models import Menu
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from utils.utils import json_response
 
 router = APIRouter()
 
@@ -48,20 +48,17 @@ async def create_menu(
 )
 async def get_menu(
     menu_id: UUID,
-    background_task: BackgroundTasks,
-    session: AsyncSession = Depends(vortex.scoped_session),
+    session: AsyncSession = Depends(vortex.read_session),
     menu_repo: MenuService = Depends(),
-) -> Menu | None:
+) -> Response:
     """
     Эндпоинт получения записи из таблицы Menu
-    :param background_task:
     :param menu_id:
     :param session:
     :param menu_repo:
     """
-    return await menu_repo.get_menu_service(
-        title=menu_id, session=session, background_task=background_task
-    )
+    answer = await menu_repo.get_menu_service(title=menu_id, session=session)
+    return json_response(answer)
 
 
 @router.get(
@@ -73,19 +70,16 @@ async def get_menu(
     responses={404: {'description': 'menu not found'}},
 )
 async def show_menus(
-    background_task: BackgroundTasks,
-    session: AsyncSession = Depends(vortex.scoped_session),
+    session: AsyncSession = Depends(vortex.read_session),
     menu_repo: MenuService = Depends(),
-) -> list[Menu]:
+) -> Response:
     """
     Эндпоинт получения списка записей в таблице Menu
-    :param background_task:
     :param session:
     :param menu_repo:
     """
-    return await menu_repo.get_all_menu_service(
-        session=session, background_task=background_task
-    )
+    answer = await menu_repo.get_all_menu_service(session=session)
+    return json_response(answer)
 
 
 @router.patch(
@@ -149,15 +143,19 @@ async def delete_menu(
 async def get_full_menu(
     background_task: BackgroundTasks,
     menu_repo: MenuService = Depends(),
-    session: AsyncSession = Depends(vortex.scoped_session),
-) -> list[Menu]:
+    session_factory: async_sessionmaker[AsyncSession] = Depends(
+        vortex.session_factory
+    ),
+) -> Response:
     """
-    Эндпоинт получения всех данных
+    Эндпоинт получения всех данных. После изменений отдается прежний
+    снимок с заголовком Warning, пока новый собирается в фоне
     :param background_task:
     :param menu_repo:
-    :param session:
+    :param session_factory:
     :return:
     """
-    return await menu_repo.get_full_service(
-        session=session, background_task=background_task
+    answer, stale = await menu_repo.get_full_service(
+        session_factory=session_factory, background_task=background_task
     )
+    return json_response(answer, headers={'Warning': STALE_WARNING} if stale else None)
@@ -1,11 +1,10 @@
 from typing import Any
-from uuid import UUID
+from uuid import UUID, uuid4
 
 from api.v1.submenu.schemas import SubMenuIn
 from settings.models import SubMenu
 from sqlalchemy import Result, delete, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from utils.utils import dishes_count
 
 
 async def add_submenu(
@@ -19,17 +18,48 @@ async def add_submenu(
     :return: answer
     """
     stmt = (
-        insert(SubMenu).values(
-            title=data.title, description=data.description, menu_id=menu_id
+        insert(SubMenu)
+        .values(title=data.title, description=data.description, menu_id=menu_id)
+        .returning(
+            SubMenu.id, SubMenu.title, SubMenu.description, SubMenu.dishes_count
         )
-    ).returning(SubMenu.id, SubMenu.title, SubMenu.description)
+    )
     result = await session.execute(stmt)
     answer = result.first()._asdict()
     await session.commit()
-    dishes = {
-        'dishes_count': await dishes_count(submenu_id=answer['id'], session=session)
-    }
-    answer.update(dishes)
+    return answer
+
+
+async def add_submenus(
+    session: AsyncSession, data: list[SubMenuIn], menu_id: UUID
+) -> list[dict[str, Any]]:
+    """
+    Функция добавления пачки записей в таблицу SubMenu одним INSERT
+    :param session:
+    :param data:
+    :param menu_id:
+    :return: answer
+    """
+    stmt = (
+        insert(SubMenu)
+        .values(
+            [
+                {
+                    'id': uuid4(),
+                    'title': submenu.title,
+                    'description': submenu.description,
+                    'menu_id': menu_id,
+                }
+                for submenu in data
+            ]
+        )
+        .returning(
+            SubMenu.id, SubMenu.title, SubMenu.description, SubMenu.dishes_count
+        )
+    )
+    result = await session.execute(stmt)
+    answer = [submenu._asdict() for submenu in result]
+    await session.commit()
     return answer
 
 
@@ -49,65 +79,79 @@ async def show_submenu(title: UUID, session: AsyncSession) -> dict | None:
             'title': answer.title,
             'description': answer.description,
             'menu_id': answer.menu_id,
-            'dishes_count': await dishes_count(submenu_id=answer.id, session=session),
+            'dishes_count': answer.dishes_count,
         }
         return data
     return None
 
 
-async def get_all_submenus(session: AsyncSession) -> list[SubMenu]:
+async def get_all_submenus(
+    menu_id: UUID, session: AsyncSession, limit: int, after: UUID | None = None
+) -> list[dict[str, Any]]:
     """
-    Функция возвращает список подменю
+    Функция возвращает страницу подменю меню по возрастанию id
+    :param menu_id:
     :param session:
-    :return: list(answer)
+    :param limit: размер страницы
+    :param after: id последнего подменю предыдущей страницы
+    :return: answer
     """
-    stmt = select(SubMenu).order_by(SubMenu.id)
+    stmt = select(
+        SubMenu.id,
+        SubMenu.title,
+        SubMenu.description,
+        SubMenu.menu_id,
+        SubMenu.dishes_count,
+    ).where(SubMenu.menu_id == menu_id)
+    if after is not None:
+        stmt = stmt.where(SubMenu.id > after)
+    stmt = stmt.order_by(SubMenu.id).limit(limit)
     result = await session.execute(stmt)
-    answer = result.scalars().all()
-    return list(answer)
+    return [submenu._asdict() for submenu in result]
 
 
 async def change_submenu(
     menu_id: UUID, submenu_id: UUID, data: SubMenuIn, session: AsyncSession
-) -> dict[str, Any]:
+) -> dict[str, Any] | None:
     """
     Функция внесения изменения в запись таблицы SubMenu
     :param menu_id:
     :param submenu_id:
     :param data:
     :param session:
-    :return: answer
+    :return: answer или None, если подменю нет
     """
     stmt = (
         update(SubMenu)
         .where(SubMenu.id == submenu_id)
         .values(title=data.title, description=data.description, menu_id=menu_id)
-        .returning(SubMenu.id, SubMenu.title, SubMenu.description, SubMenu.menu_id)
+        .returning(
+            SubMenu.id,
+            SubMenu.title,
+            SubMenu.description,
+            SubMenu.menu_id,
+            SubMenu.dishes_count,
+        )
     )
     result = await session.execute(stmt)
-    answer = result.first()._asdict()
+    answer = result.first()
     await session.commit()
-    dishes = {
-        'dishes_count': await dishes_count(submenu_id=answer['id'], session=session)
-    }
-    answer.update(dishes)
-    return answer
+    return answer._asdict() if answer else None
 
 
 async def drop_submenu(
     submenu_id: UUID, session: AsyncSession
-) -> dict[str, str | bool]:
+) -> dict[str, str | bool] | None:
     """
     Функция удаления записи из таблицы SubMenu
     :param submenu_id:
     :param session:
-    :return: dict
+    :return: dict или None, если подменю нет
     """
-    stmt = (
-        delete(SubMenu)
-        .where(SubMenu.id == submenu_id)
-        .returning(SubMenu.id, SubMenu.title, SubMenu.description, SubMenu.menu_id)
-    )
-    await session.execute(stmt)
+    stmt = delete(SubMenu).where(SubMenu.id == submenu_id).returning(SubMenu.id)
+    result = await session.execute(stmt)
+    deleted = result.first()
     await session.commit()
+    if deleted is None:
+        return None
     return {'status': True, 'message': 'The submenu has been deleted'}
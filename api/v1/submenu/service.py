@@ -3,20 +3,25 @@ from uuid import UUID
 
 from api.v1.submenu.crud import (
     add_submenu,
+    add_submenus,
     change_submenu,
     drop_submenu,
     get_all_submenus,
     show_submenu,
 )
-from api.v1.submenu.schemas import SubMenuIn
+from api.v1.submenu.schemas import SubMenuIn, SubMenuOut
 from asyncpg import UniqueViolationError
 from fastapi import BackgroundTasks
 from settings.cache import redis_cache
-from settings.models import Menu, SubMenu
+from settings.codec import schema_render
+from settings.config import PAGE_SIZE
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from utils.exceptions import MenuNotFound, SubMenuAlreadyExists, SubMenuNotFound
-from utils.utils import data_finder
+from utils.utils import foreign_key_violation
+
+render_submenu = schema_render(SubMenuOut)
+render_submenus = schema_render(list[SubMenuOut])
 
 
 class SubMenuService:
@@ -30,39 +35,77 @@ class SubMenuService:
         menu_id: UUID,
         background_task: BackgroundTasks,
     ) -> dict[str, Any]:
-        if await data_finder(table=Menu, table_id=menu_id, session=session):
-            try:
-                answer = await add_submenu(session=session, data=data, menu_id=menu_id)
-                await self.cacher.create_submenu_cache(menu_id=menu_id, item=answer)
-                background_task.add_task(
-                    self.cacher.create_submenu_cache, answer, menu_id
-                )
-                return answer
-            except (UniqueViolationError, IntegrityError):
-                raise SubMenuAlreadyExists
-        raise MenuNotFound
+        try:
+            answer = await add_submenu(session=session, data=data, menu_id=menu_id)
+        except IntegrityError as error:
+            if foreign_key_violation(error):
+                raise MenuNotFound
+            raise SubMenuAlreadyExists
+        except UniqueViolationError:
+            raise SubMenuAlreadyExists
+        await self.cacher.create_submenu_cache(
+            menu_id=menu_id, item=answer, render=render_submenu
+        )
+        background_task.add_task(
+            self.cacher.create_submenu_cache, answer, menu_id, render_submenu
+        )
+        return answer
+
+    async def add_submenus_service(
+        self,
+        session: AsyncSession,
+        data: list[SubMenuIn],
+        menu_id: UUID,
+        background_task: BackgroundTasks,
+    ) -> list[dict[str, Any]]:
+        try:
+            answer = await add_submenus(session=session, data=data, menu_id=menu_id)
+        except IntegrityError as error:
+            if foreign_key_violation(error):
+                raise MenuNotFound
+            raise SubMenuAlreadyExists
+        except UniqueViolationError:
+            raise SubMenuAlreadyExists
+        await self.cacher.create_submenus_cache(
+            menu_id=menu_id, items=answer, render=render_submenu
+        )
+        background_task.add_task(
+            self.cacher.create_submenus_cache, answer, menu_id, render_submenu
+        )
+        return answer
 
     async def get_submenu_service(
         self,
         menu_id: UUID,
         title: UUID,
         session: AsyncSession,
-        background_task: BackgroundTasks,
-    ) -> dict | None:
-        answer = await show_submenu(title=title, session=session)
+    ) -> bytes:
+        answer = await self.cacher.get_submenu_cache(
+            menu_id=menu_id,
+            submenu_id=title,
+            loader=lambda: show_submenu(title=title, session=session),
+            render=render_submenu,
+        )
         if not answer:
             raise SubMenuNotFound
-        await self.cacher.get_submenu_cache(menu_id=menu_id, submenu_id=title)
-        background_task.add_task(self.cacher.get_submenu_cache, answer, menu_id)
         return answer
 
     async def get_all_submenus_service(
-        self, menu_id: UUID, session: AsyncSession, background_task: BackgroundTasks
-    ) -> list[SubMenu]:
-        answer = await get_all_submenus(session=session)
-        await self.cacher.get_all_submenus_cache(menu_id=menu_id)
-        background_task.add_task(self.cacher.get_all_submenus_cache, answer)
-        return answer
+        self,
+        menu_id: UUID,
+        session: AsyncSession,
+        limit: int = PAGE_SIZE,
+        after: UUID | None = None,
+    ) -> bytes:
+        return await self.cacher.get_all_submenus_cache(
+            menu_id=menu_id,
+            limit=limit,
+            after=after,
+            loader=lambda: get_all_submenus(
+                menu_id=menu_id, session=session, limit=limit, after=after
+            ),
+            render=render_submenus,
+        )
 
     async def change_submenu_service(
         self,
@@ -72,14 +115,18 @@ class SubMenuService:
         session: AsyncSession,
         background_task: BackgroundTasks,
     ) -> dict[str, Any]:
-        if await data_finder(table=SubMenu, table_id=submenu_id, session=session):
-            answer = await change_submenu(
-                menu_id=menu_id, submenu_id=submenu_id, data=data, session=session
-            )
-            await self.cacher.update_submenu_cache(answer, menu_id=menu_id)
-            background_task.add_task(self.cacher.update_submenu_cache, answer, menu_id)
-            return answer
-        raise SubMenuNotFound
+        answer = await change_submenu(
+            menu_id=menu_id, submenu_id=submenu_id, data=data, session=session
+        )
+        if answer is None:
+            raise SubMenuNotFound
+        await self.cacher.update_submenu_cache(
+            answer, menu_id=menu_id, render=render_submenu
+        )
+        background_task.add_task(
+            self.cacher.update_submenu_cache, answer, menu_id, render_submenu
+        )
+        return answer
 
     async def drop_submenu_service(
         self,
@@ -88,9 +135,9 @@ class SubMenuService:
         session: AsyncSession,
         background_task: BackgroundTasks,
     ) -> dict[str, str | bool]:
-        if await data_finder(table=SubMenu, table_id=submenu_id, session=session):
-            answer = await drop_submenu(submenu_id=submenu_id, session=session)
-            await self.cacher.delete_submenu_cache(menu_id=menu_id)
-            background_task.add_task(self.cacher.delete_submenu_cache, menu_id)
-            return answer
-        raise SubMenuNotFound
+        answer = await drop_submenu(submenu_id=submenu_id, session=session)
+        if answer is None:
+            raise SubMenuNotFound
+        await self.cacher.delete_submenu_cache(menu_id=menu_id)
+        background_task.add_task(self.cacher.delete_submenu_cache, menu_id)
+        return answer
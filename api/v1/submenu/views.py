@@ -3,11 +3,18 @@ from uuid import UUID
 
 from api.v1.submenu.schemas import SubMenuIn, SubMenuOut
 from api.v1.submenu.service import SubMenuService
-from fastapi import APIRouter, BackgroundTasks, Depends, status
-from settings.config import SUBMENU_LINK, SUBMENUS_LINK
+from fastapi import APIRouter, BackgroundTasks, Body, Depends, Query, Response, status
+from settings.config import (
+    BULK_MAX_SIZE,
+    MAX_PAGE_SIZE,
+    PAGE_SIZE,
+    SUBMENU_LINK,
+    SUBMENUS_BULK_LINK,
+    SUBMENUS_LINK,
+)
 from settings.database import vortex
-from settings.models import SubMenu
 from sqlalchemy.ext.asyncio import AsyncSession
+from utils.utils import json_response
 
 router = APIRouter()
 
@@ -40,6 +47,37 @@ async def create_submenu(
     )
 
 
+@router.post(
+    SUBMENUS_BULK_LINK,
+    status_code=status.HTTP_201_CREATED,
+    response_model=list[SubMenuOut],
+    description='Создать несколько подменю одним запросом',
+    summary='Создать несколько подменю',
+    responses={
+        404: {'description': 'menu not found'},
+        400: {'description': 'Такое подменю уже есть'},
+    },
+)
+async def create_submenus(
+    menu_id: UUID,
+    background_task: BackgroundTasks,
+    menus_in: list[SubMenuIn] = Body(min_length=1, max_length=BULK_MAX_SIZE),
+    session: AsyncSession = Depends(vortex.scoped_session),
+    submenu_repo: SubMenuService = Depends(),
+) -> list[dict[str, Any]]:
+    """
+    Эндпоинт создания пачки записей в таблице SubMenu
+    :param background_task:
+    :param submenu_repo:
+    :param menu_id:
+    :param menus_in:
+    :param session:
+    """
+    return await submenu_repo.add_submenus_service(
+        data=menus_in, session=session, menu_id=menu_id, background_task=background_task
+    )
+
+
 @router.get(
     SUBMENU_LINK,
     description='Показать подменю',
@@ -50,24 +88,22 @@ async def create_submenu(
 async def get_submenu(
     menu_id: UUID,
     submenu_id: UUID,
-    background_task: BackgroundTasks,
-    session: AsyncSession = Depends(vortex.scoped_session),
+    session: AsyncSession = Depends(vortex.read_session),
     submenu_repo: SubMenuService = Depends(),
-) -> dict | None:
+) -> Response:
     """
     Эндпоинт получения записи из таблицы SubMenu
-    :param background_task:
     :param menu_id:
     :param submenu_id:
     :param session:
     :param submenu_repo:
     """
-    return await submenu_repo.get_submenu_service(
+    answer = await submenu_repo.get_submenu_service(
         title=submenu_id,
         session=session,
         menu_id=menu_id,
-        background_task=background_task,
     )
+    return json_response(answer)
 
 
 @router.get(
@@ -79,20 +115,24 @@ async def get_submenu(
 )
 async def show_submenus(
     menu_id: UUID,
-    background_task: BackgroundTasks,
-    session: AsyncSession = Depends(vortex.scoped_session),
+    limit: int = Query(default=PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    after: UUID | None = None,
+    session: AsyncSession = Depends(vortex.read_session),
     submenu_repo: SubMenuService = Depends(),
-) -> list[SubMenu]:
+) -> Response:
     """
-    Эндпоинт получения списка записей в таблице SubMenu
-    :param background_task:
+    Эндпоинт получения страницы подменю меню.
+    Следующая страница запрашивается с after = id последнего подменю
     :param menu_id:
+    :param limit:
+    :param after:
     :param session:
     :param submenu_repo:
     """
-    return await submenu_repo.get_all_submenus_service(
-        session=session, menu_id=menu_id, background_task=background_task
+    answer = await submenu_repo.get_all_submenus_service(
+        session=session, menu_id=menu_id, limit=limit, after=after
     )
+    return json_response(answer)
 
 
 @router.patch(
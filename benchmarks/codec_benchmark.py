@@ -0,0 +1,80 @@
+"""
+Сравнение кодеков кэша: время encode/decode и размер значения в Redis.
+
+Запуск из корня проекта:
+    python -m benchmarks.codec_benchmark --menus 50 --rounds 200
+"""
+import argparse
+import timeit
+from uuid import uuid4
+
+from settings.codec import CacheCodec, OrjsonCodec, PickleCodec
+from settings.models import Dish, Menu, SubMenu
+
+
+def build_full_base(menus: int) -> list[Menu]:
+    """Дерево ORM объектов меню -> подменю -> блюдо, как в /all_base"""
+    items = []
+    for number in range(menus):
+        menu = Menu(id=uuid4(), title=f'Menu {number}', description='Some description')
+        submenu = SubMenu(
+            id=uuid4(),
+            title=f'Submenu {number}',
+            description='Some description',
+            menu_id=menu.id,
+        )
+        submenu.dishes = [
+            Dish(
+                id=uuid4(),
+                title=f'Dish {number}',
+                description='Some description',
+                price='123.45',
+                discount=0,
+                submenu_id=submenu.id,
+            )
+        ]
+        menu.submenu_link = [submenu]
+        items.append(menu)
+    return items
+
+
+def build_menus(menus: int) -> list[dict]:
+    """Список меню в форме MenuOut"""
+    return [
+        {
+            'id': uuid4(),
+            'title': f'Menu {number}',
+            'description': 'Some description',
+            'submenus_count': 1,
+            'dishes_count': 1,
+        }
+        for number in range(menus)
+    ]
+
+
+def measure(codec: CacheCodec, payload: object, rounds: int) -> tuple[float, float, int]:
+    raw = codec.encode(payload)
+    encode = timeit.timeit(lambda: codec.encode(payload), number=rounds) / rounds
+    decode = timeit.timeit(lambda: codec.decode(raw), number=rounds) / rounds
+    return encode * 1e6, decode * 1e6, len(raw)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--menus', type=int, default=50)
+    parser.add_argument('--rounds', type=int, default=200)
+    args = parser.parse_args()
+
+    payloads = {
+        'full_base_menu': build_full_base(args.menus),
+        '/menus': build_menus(args.menus),
+    }
+    print(f'{"payload":<16}{"codec":<8}{"encode, us":>12}{"decode, us":>12}{"bytes":>10}')
+    for name, payload in payloads.items():
+        for codec in (PickleCodec(), OrjsonCodec()):
+            encode, decode, size = measure(codec, payload, args.rounds)
+            print(f'{name:<16}{codec.name:<8}{encode:>12.1f}{decode:>12.1f}{size:>10}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""
+Пропускная способность запущенного сервера: конкурентные GET запросы
+на один адрес в течение заданного времени.
+
+Запуск из корня проекта, сервер должен уже слушать порт:
+    python -m benchmarks.server_benchmark --url http://127.0.0.1:8000/api/v1/menus
+"""
+import argparse
+import asyncio
+from statistics import quantiles
+from time import perf_counter
+
+import httpx
+
+
+async def worker(client: httpx.AsyncClient, url: str, deadline: float) -> list[float]:
+    latencies = []
+    while (started := perf_counter()) < deadline:
+        response = await client.get(url)
+        response.raise_for_status()
+        latencies.append(perf_counter() - started)
+    return latencies
+
+
+async def run(url: str, concurrency: int, seconds: float) -> None:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await client.get(url)
+        started = perf_counter()
+        results = await asyncio.gather(
+            *(worker(client, url, started + seconds) for _ in range(concurrency))
+        )
+        elapsed = perf_counter() - started
+    latencies = [latency for result in results for latency in result]
+    percentiles = quantiles(latencies, n=100)
+    print(
+        f'{len(latencies) / elapsed:>10.0f} req/s'
+        f'{percentiles[49] * 1000:>10.1f} ms p50'
+        f'{percentiles[98] * 1000:>10.1f} ms p99'
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--url', default='http://127.0.0.1:8000/api/v1/menus')
+    parser.add_argument('--concurrency', type=int, default=64)
+    parser.add_argument('--seconds', type=float, default=20)
+    args = parser.parse_args()
+    asyncio.run(run(args.url, args.concurrency, args.seconds))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,4 +2,4 @@
 
 alembic upgrade head
 
-uvicorn runner:app --host 0.0.0.0 --port 8000 --reload
+exec gunicorn -c gunicorn.conf.py
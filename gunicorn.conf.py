@@ -0,0 +1,25 @@
+"""
+Боевой запуск: gunicorn следит за воркерами uvicorn, перезапускает упавшие
+и дает им GRACEFUL_TIMEOUT на завершение запросов при остановке.
+
+    gunicorn -c gunicorn.conf.py
+"""
+from settings.config import (
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_KEEP_ALIVE,
+    SERVER_PORT,
+    SERVER_TIMEOUT,
+    SERVER_WORKERS,
+)
+
+wsgi_app = 'runner:app'
+bind = f'{SERVER_HOST}:{SERVER_PORT}'
+workers = SERVER_WORKERS
+worker_class = 'utils.server.ProductionWorker'
+keepalive = SERVER_KEEP_ALIVE
+backlog = SERVER_BACKLOG
+timeout = SERVER_TIMEOUT
+graceful_timeout = SERVER_GRACEFUL_TIMEOUT
+reload = False
@@ -1,15 +1,95 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager, suppress
+from typing import AsyncIterator
+
 import uvicorn
 from api import router as main_router
-from fastapi import FastAPI
+from fastapi import FastAPI, Request, status
+from fastapi.responses import JSONResponse
+from settings.cache import redis_cache
+from settings.config import (
+    SERVER_BACKLOG,
+    SERVER_GRACEFUL_TIMEOUT,
+    SERVER_HOST,
+    SERVER_KEEP_ALIVE,
+    SERVER_PORT,
+    SERVER_RELOAD,
+    SERVER_WORKERS,
+)
+from settings.database import vortex
+from utils.middleware import DrainMiddleware, ReadYourWritesMiddleware, in_flight
+from utils.utils import redis_pool
+from utils.warmup import warm_up_cache
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(app: FastAPI) -> None:
+    """Готовность отмечается и при ошибке прогрева: холодный кэш медленнее, но рабочий"""
+    try:
+        await warm_up_cache(vortex.session_factory())
+    except Exception:
+        logger.exception('Cache warm-up failed')
+    app.state.ready = True
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """
+    Пулы Postgres создаются на старте. При остановке /ready сразу отвечает 503,
+    текущие запросы и их фоновые задачи дорабатывают, затем пулы закрываются
+    """
+    app.state.ready = False
+    vortex.connect()
+    await redis_cache.cache_maker.ping()
+    listener = asyncio.create_task(redis_cache.listen_invalidations())
+    warmer = asyncio.create_task(warm_up(app))
+    yield
+    app.state.ready = False
+    if not await in_flight.drain(SERVER_GRACEFUL_TIMEOUT):
+        logger.warning('%d requests still running at shutdown', in_flight.count)
+    for task in (warmer, listener):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await vortex.dispose()
+    await redis_pool.disconnect()
 
 
 app = FastAPI(
     title='Ylab Menu Api',
     description='API для работы с Меню, Подменю и Блюдом',
     version='4.0.0',
+    lifespan=lifespan,
 )
 
 app.include_router(router=main_router, tags=['api'])
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(DrainMiddleware)
+
+
+@app.get('/ready', include_in_schema=False)
+async def ready(request: Request) -> JSONResponse:
+    """Готовность к трафику: 503, пока не закончился прогрев кэша"""
+    is_ready = getattr(request.app.state, 'ready', False)
+    return JSONResponse(
+        {'ready': is_ready},
+        status_code=status.HTTP_200_OK if is_ready else status.HTTP_503_SERVICE_UNAVAILABLE,
+    )
+
 
 if __name__ == '__main__':
-    uvicorn.run('runner:app', reload=True)
+    # Для разработки SERVER_RELOAD=true, в контейнере запуск через gunicorn.conf.py
+    uvicorn.run(
+        'runner:app',
+        host=SERVER_HOST,
+        port=SERVER_PORT,
+        reload=SERVER_RELOAD,
+        workers=None if SERVER_RELOAD else SERVER_WORKERS,
+        loop='uvloop',
+        http='httptools',
+        timeout_keep_alive=SERVER_KEEP_ALIVE,
+        backlog=SERVER_BACKLOG,
+        timeout_graceful_shutdown=SERVER_GRACEFUL_TIMEOUT,
+    )
@@ -1,253 +1,604 @@
-import pickle
-from uuid import UUID
-
+import asyncio
+import logging
+import random
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable
+from uuid import UUID, uuid4
+
+import orjson
+from aioredis.client import Pipeline
+from aioredis.exceptions import ConnectionError, RedisError
+from fastapi import BackgroundTasks
+from settings.codec import CacheCodec, orjson_codec
 from settings.config import (
+    CACHE_LOCK_RETRIES,
+    CACHE_LOCK_TIMEOUT,
+    CACHE_LOCK_WAIT,
+    CACHE_VERSION,
     DISH_LINK,
     DISHES_LINK,
     EXPIRATION,
+    EXPIRATION_JITTER,
+    FULL_BASE_KEY,
+    GENERATION,
+    INVALIDATION_CHANNEL,
+    LOCAL_CACHE_SIZE,
+    LOCAL_EXPIRATION,
     MENU_LINK,
+    MENU_TAG,
     MENUS_LINK,
+    PAGES_TAG,
+    STALE_EXPIRATION,
     SUBMENU_LINK,
+    SUBMENU_TAG,
     SUBMENUS_LINK,
 )
-from settings.models import Dish, Menu, SubMenu
+from settings.local_cache import LocalCache
+from utils.metrics import metrics, namespace
 from utils.utils import redis_connector
 
+logger = logging.getLogger(__name__)
+
+Loader = Callable[[], Awaitable[Any]]
+Render = Callable[[Any], bytes]
+
+
+# Удаляет все ключи, зарегистрированные в тегах, и сами теги за один вызов
+INVALIDATE_TAGS_SCRIPT = """
+local keys = redis.call('SUNION', unpack(KEYS))
+for i = 1, #keys, 1000 do
+    redis.call('UNLINK', unpack(keys, i, math.min(i + 999, #keys)))
+end
+redis.call('UNLINK', unpack(KEYS))
+return #keys
+"""
+
+# Снимает блокировку, только если она все еще принадлежит этому загрузчику
+RELEASE_LOCK_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def menu_tags(menu_id: UUID | str) -> tuple[str]:
+    return (MENU_TAG.format(menu_id=menu_id),)
+
+
+def submenu_tags(menu_id: UUID | str, submenu_id: UUID | str) -> tuple[str, str]:
+    return (
+        MENU_TAG.format(menu_id=menu_id),
+        SUBMENU_TAG.format(submenu_id=submenu_id),
+    )
+
+
+def page_key(link: str, limit: int, after: UUID | None) -> str:
+    return f'{link}?limit={limit}&after={after or ""}'
+
+
+def pages_tag(link: str) -> str:
+    return PAGES_TAG.format(link=link)
+
+
+class CacheBatch:
+    """Копит удаления и записи одной мутации и отправляет их одним MULTI/EXEC"""
+
+    def __init__(self, cache: 'RedisCache') -> None:
+        self.cache = cache
+        self.pipe = cache.cache_maker.pipeline(transaction=True)
+        self.keys: set[str] = set()
+        self.tags: set[str] = set()
+
+    def delete(self, *keys: str) -> None:
+        self.keys.update(keys)
+        self.pipe.unlink(*map(self.cache.key, keys))
+        for key in keys:
+            metrics.inc('cache_invalidations_total', namespace=namespace(key))
+
+    def delete_tags(self, *tags: str) -> None:
+        self.tags.update(tags)
+        self.pipe.eval(INVALIDATE_TAGS_SCRIPT, len(tags), *map(self.cache.key, tags))
+        for tag in tags:
+            metrics.inc('cache_invalidations_total', namespace=namespace(tag))
+
+    def mark_stale(self, name: str) -> None:
+        """Снимок остается в Redis, но его поколение перестает быть текущим"""
+        self.keys.add(name)
+        self.pipe.incr(self.cache.key(GENERATION.format(name=name)))
+        metrics.inc('cache_invalidations_total', namespace=namespace(name))
+
+    def set(self, key: str, body: bytes, *tags: str) -> None:
+        self.keys.add(key)
+        self.cache.stage_write(self.pipe, key, body, *tags)
+
+    async def flush(self) -> None:
+        if self.keys or self.tags:
+            self.pipe.publish(
+                INVALIDATION_CHANNEL,
+                orjson.dumps(
+                    {
+                        'origin': self.cache.origin,
+                        'keys': sorted(self.keys),
+                        'tags': sorted(self.tags),
+                    }
+                ),
+            )
+        self.cache.drop_local(self.keys, self.tags)
+        with metrics.timer('cache_latency_seconds', namespace='batch', op='flush'):
+            await self.pipe.execute()
+
 
 class RedisCache:
-    def __init__(self) -> None:
+    def __init__(self, codec: CacheCodec = orjson_codec) -> None:
         self.cache_maker = redis_connector()
+        self.codec = codec
+        self.prefix = f'{codec.name}:v{CACHE_VERSION}:'
+        self.local = LocalCache(maxsize=LOCAL_CACHE_SIZE, ttl=LOCAL_EXPIRATION)
+        self.origin = uuid4().hex
+        self.in_flight: dict[str, asyncio.Future] = {}
+
+    def key(self, name: str) -> str:
+        return self.prefix + name
+
+    def encode(self, value: Any, render: Render | None = None) -> bytes:
+        """Тело ответа сериализуется один раз, при записи в кэш"""
+        return (render or self.codec.encode)(value)
+
+    async def read(self, name: str, *tags: str) -> bytes | None:
+        space = namespace(name)
+        body = self.local.get(name)
+        if body is not None:
+            metrics.inc('cache_hits_total', namespace=space, tier='local')
+            return body
+        with metrics.timer('cache_latency_seconds', namespace=space, op='get'):
+            body = await self.cache_maker.get(self.key(name))
+        if body:
+            metrics.inc('cache_hits_total', namespace=space, tier='redis')
+            metrics.inc('cache_read_bytes_total', len(body), namespace=space)
+            self.local.set(name, body, *tags)
+            return body
+        metrics.inc('cache_misses_total', namespace=space)
+        return None
 
-    async def delete_cache(
+    def stage_write(self, pipe: Pipeline, name: str, body: bytes, *tags: str) -> None:
+        key = self.key(name)
+        metrics.inc('cache_sets_total', namespace=namespace(name))
+        metrics.inc('cache_written_bytes_total', len(body), namespace=namespace(name))
+        # Разброс TTL, чтобы ключи, записанные вместе, не истекали разом
+        pipe.set(key, body, ex=EXPIRATION + random.randint(0, EXPIRATION_JITTER))
+        for tag in map(self.key, tags):
+            pipe.sadd(tag, key)
+            pipe.expire(tag, EXPIRATION + EXPIRATION_JITTER)
+
+    async def write(self, name: str, body: bytes, *tags: str) -> None:
+        pipe = self.cache_maker.pipeline(transaction=False)
+        self.stage_write(pipe, name, body, *tags)
+        with metrics.timer('cache_latency_seconds', namespace=namespace(name), op='set'):
+            await pipe.execute()
+
+    async def load_body(
+        self, name: str, loader: Loader, render: Render | None
+    ) -> bytes | None:
+        """Загрузка из БД и сериализация ответа с замером времени каждой"""
+        space = namespace(name)
+        with metrics.timer('cache_latency_seconds', namespace=space, op='load'):
+            item = await loader()
+        if item is None:
+            return None
+        with metrics.timer('cache_latency_seconds', namespace=space, op='render'):
+            return self.encode(item, render)
+
+    async def read_through(
         self,
-        pattern: str,
-    ) -> None:
-        for key in await self.cache_maker.keys(pattern + '*'):
-            await self.cache_maker.delete(key)
+        name: str,
+        loader: Loader | None,
+        *tags: str,
+        render: Render | None = None,
+    ) -> bytes | None:
+        """
+        Читает ключ, при промахе загружает данные из БД и кладет их в кэш.
+        Пустой результат загрузки (None) не кэшируется
+        """
+        body = await self.read(name, *tags)
+        if body is not None or loader is None:
+            return body
+        return await self.single_flight(
+            name, lambda: self.load(name, loader, *tags, render=render)
+        )
 
-    async def set_all_dishes_cache(
+    async def single_flight(self, name: str, loader: Loader) -> Any | None:
+        """Параллельные промахи по ключу внутри процесса ждут одну загрузку"""
+        flight = self.in_flight.get(name)
+        if flight is None:
+            flight = asyncio.ensure_future(loader())
+            self.in_flight[name] = flight
+            flight.add_done_callback(lambda _: self.in_flight.pop(name, None))
+        return await asyncio.shield(flight)
+
+    async def load(
+        self, name: str, loader: Loader, *tags: str, render: Render | None = None
+    ) -> bytes | None:
+        """
+        Один загрузчик на ключ среди всех воркеров: остальные ждут,
+        пока он положит значение в кэш или отпустит блокировку
+        """
+        lock, token = self.key(f'lock:{name}'), uuid4().hex
+        if await self.cache_maker.set(lock, token, nx=True, ex=CACHE_LOCK_TIMEOUT):
+            try:
+                body = await self.load_body(name, loader, render)
+                if body is not None:
+                    await self.write(name, body, *tags)
+                return body
+            finally:
+                await self.cache_maker.eval(RELEASE_LOCK_SCRIPT, 1, lock, token)
+        for _ in range(CACHE_LOCK_RETRIES):
+            await asyncio.sleep(CACHE_LOCK_WAIT)
+            pipe = self.cache_maker.pipeline(transaction=False)
+            body, locked = await pipe.get(self.key(name)).exists(lock).execute()
+            if body:
+                self.local.set(name, body, *tags)
+                return body
+            if not locked:
+                break
+        return await self.load_body(name, loader, render)
+
+    async def read_stale_while_revalidate(
         self,
-        menu_id: str,
-        submenu_id: str,
-        items: list[Dish],
+        name: str,
+        loader: Loader,
+        background_task: BackgroundTasks,
+        render: Render | None = None,
+    ) -> tuple[bytes, bool]:
+        """
+        Отдает последний снимок, даже если после него были изменения.
+        Устаревший снимок пересобирается в фоне, загрузка в запросе
+        происходит только если снимка нет совсем
+        :return: тело ответа и признак того, что снимок устарел
+        """
+        space = namespace(name)
+        body = self.local.get(name)
+        if body is not None:
+            metrics.inc('cache_hits_total', namespace=space, tier='local')
+            return body, False
+        with metrics.timer('cache_latency_seconds', namespace=space, op='get'):
+            snapshot, generation = await self.cache_maker.mget(
+                self.key(name), self.key(GENERATION.format(name=name))
+            )
+        if snapshot is None:
+            metrics.inc('cache_misses_total', namespace=space)
+            body = await self.single_flight(
+                name, lambda: self.rebuild_snapshot(name, loader, render)
+            )
+            return body, False
+        # Снимок хранится как "<поколение>\n<тело ответа>"
+        metrics.inc('cache_read_bytes_total', len(snapshot), namespace=space)
+        snapshot_generation, _, body = snapshot.partition(b'\n')
+        if int(snapshot_generation) == int(generation or 0):
+            metrics.inc('cache_hits_total', namespace=space, tier='redis')
+            self.local.set(name, body)
+            return body, False
+        metrics.inc('cache_hits_total', namespace=space, tier='stale')
+        background_task.add_task(self.revalidate, name, loader, render)
+        return body, True
+
+    async def rebuild_snapshot(
+        self, name: str, loader: Loader, render: Render | None = None
+    ) -> bytes:
+        """
+        Поколение читается до загрузки: если данные изменятся во время
+        пересборки, новый снимок сразу окажется устаревшим
+        """
+        generation = await self.cache_maker.get(self.key(GENERATION.format(name=name)))
+        body = await self.load_body(name, loader, render)
+        snapshot = b'%d\n%b' % (int(generation or 0), body)
+        metrics.inc('cache_sets_total', namespace=namespace(name))
+        metrics.inc('cache_written_bytes_total', len(snapshot), namespace=namespace(name))
+        await self.cache_maker.set(self.key(name), snapshot, ex=STALE_EXPIRATION)
+        return body
+
+    async def revalidate(
+        self, name: str, loader: Loader, render: Render | None = None
     ) -> None:
-        await self.cache_maker.set(
-            DISHES_LINK.format(menu_id=menu_id, submenu_id=submenu_id),
-            pickle.dumps(items),
-            ex=EXPIRATION,
-        )
+        """Фоновая пересборка снимка, одна на все воркеры"""
+        lock, token = self.key(f'lock:{name}'), uuid4().hex
+        if not await self.cache_maker.set(lock, token, nx=True, ex=CACHE_LOCK_TIMEOUT):
+            return
+        try:
+            await self.single_flight(
+                name, lambda: self.rebuild_snapshot(name, loader, render)
+            )
+        finally:
+            await self.cache_maker.eval(RELEASE_LOCK_SCRIPT, 1, lock, token)
+
+    async def unlink(self, *names: str) -> None:
+        async with self.batch() as batch:
+            batch.delete(*names)
+
+    @asynccontextmanager
+    async def batch(self) -> AsyncIterator[CacheBatch]:
+        batch = CacheBatch(self)
+        yield batch
+        await batch.flush()
+
+    async def delete_tags_cache(self, *tags: str) -> None:
+        async with self.batch() as batch:
+            batch.delete_tags(*tags)
+
+    def drop_local(self, keys: Iterable[str], tags: Iterable[str]) -> None:
+        self.local.discard(*keys)
+        self.local.discard_tags(tags)
+
+    async def listen_invalidations(self) -> None:
+        """
+        Сбрасывает локальный кэш по сообщениям других воркеров.
+        После переподключения локальный кэш очищается целиком,
+        так как пропущенные сообщения не восстановить
+        """
+        while True:
+            pubsub = self.cache_maker.pubsub(ignore_subscribe_messages=True)
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                self.local.clear()
+                async for message in pubsub.listen():
+                    data = orjson.loads(message['data'])
+                    if data['origin'] != self.origin:
+                        self.drop_local(data['keys'], data['tags'])
+            except (ConnectionError, RedisError):
+                logger.exception('Invalidation channel lost, reconnecting')
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.reset()
 
     async def get_all_dishes_cache(
         self,
         menu_id: UUID,
         submenu_id: UUID,
-    ) -> list[Dish] | None:
-        cache = await self.cache_maker.get(
-            DISHES_LINK.format(menu_id=menu_id, submenu_id=submenu_id),
+        limit: int,
+        after: UUID | None = None,
+        loader: Loader | None = None,
+        render: Render | None = None,
+    ) -> bytes | None:
+        link = DISHES_LINK.format(menu_id=menu_id, submenu_id=submenu_id)
+        return await self.read_through(
+            page_key(link, limit, after),
+            loader,
+            *submenu_tags(menu_id, submenu_id),
+            pages_tag(link),
+            render=render,
         )
-        if cache:
-            items = pickle.loads(cache)
-            return items
-        return None
 
     async def set_dish_cache(
         self,
         item: dict,
         submenu_id: UUID,
         menu_id: UUID,
+        render: Render | None = None,
     ) -> None:
-        await self.cache_maker.set(
-            DISH_LINK.format(
-                menu_id=menu_id,
-                submenu_id=submenu_id,
-                dish_id=item['id'],
-            ),
-            pickle.dumps(item),
-            ex=EXPIRATION,
-        )
+        async with self.batch() as batch:
+            self._stage_dish(batch, item, submenu_id, menu_id, render)
 
     async def get_dish_cache(
         self,
         dish_id: UUID,
         menu_id: UUID,
         submenu_id: UUID,
-    ) -> Dish | None:
-        cache = await self.cache_maker.get(
+        loader: Loader | None = None,
+        render: Render | None = None,
+    ) -> bytes | None:
+        return await self.read_through(
             DISH_LINK.format(
                 menu_id=menu_id,
                 submenu_id=submenu_id,
                 dish_id=dish_id,
             ),
+            loader,
+            *submenu_tags(menu_id, submenu_id),
+            render=render,
         )
-        if cache:
-            item = pickle.loads(cache)
-            return item
-        return None
 
     async def create_dish_cache(
         self,
         item: dict,
         submenu_id: UUID,
         menu_id: UUID,
+        render: Render | None = None,
     ) -> None:
-        await self.delete_cache(MENU_LINK.format(menu_id=menu_id))
-        await self.delete_all_menu_cache()
-        await self.set_dish_cache(
-            item=item,
-            submenu_id=submenu_id,
-            menu_id=menu_id,
-        )
+        await self.create_dishes_cache([item], submenu_id, menu_id, render)
+
+    async def create_dishes_cache(
+        self,
+        items: list[dict],
+        submenu_id: UUID,
+        menu_id: UUID,
+        render: Render | None = None,
+    ) -> None:
+        async with self.batch() as batch:
+            batch.delete_tags(*menu_tags(menu_id))
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
+            for item in items:
+                self._stage_dish(batch, item, submenu_id, menu_id, render)
 
     async def update_dish_cache(
         self,
         item: dict,
         menu_id: UUID,
         submenu_id: UUID,
+        render: Render | None = None,
     ) -> None:
-        await self.delete_all_dish_cache(submenu_id, menu_id)
-        await self.delete_full_base_cache()
-        await self.set_dish_cache(
-            item=item,
-            submenu_id=submenu_id,
-            menu_id=menu_id,
-        )
+        async with self.batch() as batch:
+            batch.delete_tags(
+                pages_tag(DISHES_LINK.format(menu_id=menu_id, submenu_id=submenu_id))
+            )
+            batch.mark_stale(FULL_BASE_KEY)
+            self._stage_dish(batch, item, submenu_id, menu_id, render)
 
     async def delete_dish_cache(self, menu_id: UUID) -> None:
-        await self.delete_cache(MENU_LINK.format(menu_id=menu_id))
-        await self.delete_all_menu_cache()
+        async with self.batch() as batch:
+            batch.delete_tags(*menu_tags(menu_id))
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
 
     async def delete_all_dish_cache(
         self,
         submenu_id: UUID,
         menu_id: UUID,
     ) -> None:
-        await self.cache_maker.delete(
-            DISHES_LINK.format(menu_id=menu_id, submenu_id=submenu_id)
-        )
-
-    async def set_all_submenus_cache(
-        self,
-        menu_id: UUID,
-        items: list[SubMenu],
-    ) -> None:
-        await self.cache_maker.set(
-            SUBMENUS_LINK.format(menu_id=menu_id),
-            pickle.dumps(items),
-            ex=EXPIRATION,
+        await self.delete_tags_cache(
+            pages_tag(DISHES_LINK.format(menu_id=menu_id, submenu_id=submenu_id))
         )
 
     async def get_all_submenus_cache(
         self,
         menu_id: UUID,
-    ) -> list[SubMenu] | None:
-        cache = await self.cache_maker.get(SUBMENUS_LINK.format(menu_id=menu_id))
-        if cache:
-            items = pickle.loads(cache)
-            return items
-        return None
-
-    async def set_submenu_cache(self, item: dict, menu_id: UUID) -> None:
-        await self.cache_maker.set(
-            SUBMENU_LINK.format(
-                menu_id=menu_id,
-                submenu_id=item['id'],
-            ),
-            pickle.dumps(item),
-            ex=EXPIRATION,
+        limit: int,
+        after: UUID | None = None,
+        loader: Loader | None = None,
+        render: Render | None = None,
+    ) -> bytes | None:
+        link = SUBMENUS_LINK.format(menu_id=menu_id)
+        return await self.read_through(
+            page_key(link, limit, after),
+            loader,
+            *menu_tags(menu_id),
+            pages_tag(link),
+            render=render,
         )
 
+    async def set_submenu_cache(
+        self, item: dict, menu_id: UUID, render: Render | None = None
+    ) -> None:
+        async with self.batch() as batch:
+            self._stage_submenu(batch, item, menu_id, render)
+
     async def get_submenu_cache(
-        self, submenu_id: UUID, menu_id: UUID
-    ) -> SubMenu | None:
-        cache = await self.cache_maker.get(
+        self,
+        submenu_id: UUID,
+        menu_id: UUID,
+        loader: Loader | None = None,
+        render: Render | None = None,
+    ) -> bytes | None:
+        return await self.read_through(
             SUBMENU_LINK.format(menu_id=menu_id, submenu_id=submenu_id),
+            loader,
+            *submenu_tags(menu_id, submenu_id),
+            render=render,
         )
-        if cache:
-            item = pickle.loads(cache)
-            return item
-        return None
 
-    async def create_submenu_cache(self, item: dict, menu_id: UUID) -> None:
-        await self.delete_cache(
-            MENU_LINK.format(menu_id=menu_id),
-        )
-        await self.delete_all_menu_cache()
-        await self.set_submenu_cache(item, menu_id=menu_id)
+    async def create_submenu_cache(
+        self, item: dict, menu_id: UUID, render: Render | None = None
+    ) -> None:
+        await self.create_submenus_cache([item], menu_id, render)
 
-    async def update_submenu_cache(self, item: dict, menu_id: UUID) -> None:
-        await self.delete_all_submenu_cache(item['id'])
-        await self.delete_full_base_cache()
-        await self.set_submenu_cache(item, menu_id=menu_id)
+    async def create_submenus_cache(
+        self, items: list[dict], menu_id: UUID, render: Render | None = None
+    ) -> None:
+        async with self.batch() as batch:
+            batch.delete_tags(*menu_tags(menu_id))
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
+            for item in items:
+                self._stage_submenu(batch, item, menu_id, render)
+
+    async def update_submenu_cache(
+        self, item: dict, menu_id: UUID, render: Render | None = None
+    ) -> None:
+        async with self.batch() as batch:
+            batch.delete_tags(pages_tag(SUBMENUS_LINK.format(menu_id=menu_id)))
+            batch.mark_stale(FULL_BASE_KEY)
+            self._stage_submenu(batch, item, menu_id, render)
 
     async def delete_submenu_cache(self, menu_id: UUID) -> None:
-        await self.delete_cache(MENU_LINK.format(menu_id=menu_id))
-        await self.delete_all_menu_cache()
+        async with self.batch() as batch:
+            batch.delete_tags(*menu_tags(menu_id))
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
 
     async def delete_all_submenu_cache(self, menu_id: UUID) -> None:
-        await self.cache_maker.delete(SUBMENUS_LINK.format(menu_id=menu_id))
+        await self.delete_tags_cache(pages_tag(SUBMENUS_LINK.format(menu_id=menu_id)))
 
-    async def set_all_menus_cache(self, items: list[Menu]) -> None:
-        await self.cache_maker.set(
-            MENUS_LINK,
-            pickle.dumps(items),
-            ex=EXPIRATION,
-        )
+    async def get_all_menus_cache(
+        self, loader: Loader | None = None, render: Render | None = None
+    ) -> bytes | None:
+        return await self.read_through(MENUS_LINK, loader, render=render)
 
-    async def get_all_menus_cache(self) -> list[Menu] | None:
-        cache = await self.cache_maker.get(MENUS_LINK)
-        if cache:
-            items = pickle.loads(cache)
-            return items
-        return None
-
-    async def set_full_base_menu_cache(self, items: list[Menu]) -> None:
-        await self.cache_maker.set(
-            'full_base_menu',
-            pickle.dumps(items),
-            ex=EXPIRATION,
+    async def get_full_base_menu_cache(
+        self,
+        loader: Loader,
+        background_task: BackgroundTasks,
+        render: Render | None = None,
+    ) -> tuple[bytes, bool]:
+        return await self.read_stale_while_revalidate(
+            FULL_BASE_KEY, loader, background_task, render
         )
 
-    async def get_full_base_menu_cache(self) -> list[Menu] | None:
-        cache = await self.cache_maker.get('full_base_menu')
-        if cache:
-            items = pickle.loads(cache)
-            return items
-        return None
-
-    async def set_menu_cache(self, item: Menu) -> None:
-        await self.cache_maker.set(
-            MENU_LINK.format(menu_id=str(item.id)),
-            pickle.dumps(item),
-            ex=EXPIRATION,
+    async def get_menu_cache(
+        self,
+        menu_id: UUID,
+        loader: Loader | None = None,
+        render: Render | None = None,
+    ) -> bytes | None:
+        return await self.read_through(
+            MENU_LINK.format(menu_id=menu_id),
+            loader,
+            *menu_tags(menu_id),
+            render=render,
         )
 
-    async def get_menu_cache(self, menu_id: UUID) -> Menu | None:
-        cache = await self.cache_maker.get(MENU_LINK.format(menu_id=menu_id))
-        if cache:
-            item = pickle.loads(cache)
-            return item
-        return None
-
-    async def create_update_menu_cache(self, item: dict) -> None:
-        await self.delete_all_menu_cache()
-        await self.cache_maker.set(
-            MENU_LINK.format(menu_id=item['id']),
-            pickle.dumps(item),
-            ex=EXPIRATION,
-        )
+    async def create_update_menu_cache(
+        self, item: dict, render: Render | None = None
+    ) -> None:
+        async with self.batch() as batch:
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
+            batch.set(
+                MENU_LINK.format(menu_id=item['id']),
+                self.encode(item, render),
+                *menu_tags(item['id']),
+            )
 
     async def delete_all_menu_cache(self) -> None:
-        await self.cache_maker.delete(MENUS_LINK)
-        await self.delete_full_base_cache()
+        async with self.batch() as batch:
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
 
     async def delete_full_base_cache(self) -> None:
-        await self.cache_maker.delete('full_base_menu')
+        async with self.batch() as batch:
+            batch.mark_stale(FULL_BASE_KEY)
 
     async def delete_menu_cache(self, menu_id: UUID) -> None:
-        await self.delete_cache(
-            MENU_LINK.format(menu_id=menu_id),
+        async with self.batch() as batch:
+            batch.delete_tags(*menu_tags(menu_id))
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
+
+    def _stage_dish(
+        self,
+        batch: CacheBatch,
+        item: dict,
+        submenu_id: UUID,
+        menu_id: UUID,
+        render: Render | None,
+    ) -> None:
+        batch.set(
+            DISH_LINK.format(
+                menu_id=menu_id,
+                submenu_id=submenu_id,
+                dish_id=item['id'],
+            ),
+            self.encode(item, render),
+            *submenu_tags(menu_id, submenu_id),
+        )
+
+    def _stage_submenu(
+        self, batch: CacheBatch, item: dict, menu_id: UUID, render: Render | None
+    ) -> None:
+        batch.set(
+            SUBMENU_LINK.format(menu_id=menu_id, submenu_id=item['id']),
+            self.encode(item, render),
+            *submenu_tags(menu_id, item['id']),
         )
-        await self.delete_all_menu_cache()
 
 
 redis_cache = RedisCache()
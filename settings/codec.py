@@ -0,0 +1,100 @@
+import pickle
+from functools import cache
+from typing import Any, Callable
+from uuid import UUID
+
+import orjson
+from pydantic import BaseModel, TypeAdapter
+from settings.models import Base
+from sqlalchemy import Row, inspect
+from sqlalchemy.orm import MANYTOONE
+
+
+class CacheCodec:
+    """Базовый кодек значений кэша"""
+
+    name: str = 'base'
+
+    def encode(self, value: Any) -> bytes:
+        raise NotImplementedError
+
+    def decode(self, raw: bytes) -> Any:
+        raise NotImplementedError
+
+
+class PickleCodec(CacheCodec):
+    """Прежний формат: pickle исходных ORM объектов"""
+
+    name = 'pickle'
+
+    def encode(self, value: Any) -> bytes:
+        return pickle.dumps(value)
+
+    def decode(self, raw: bytes) -> Any:
+        return pickle.loads(raw)
+
+
+class OrjsonCodec(CacheCodec):
+    """JSON в форме MenuOut/SubMenuOut/DishOut, без служебных полей ORM"""
+
+    name = 'json'
+
+    def encode(self, value: Any) -> bytes:
+        return orjson.dumps(value, default=to_primitive)
+
+    def decode(self, raw: bytes) -> Any:
+        return orjson.loads(raw)
+
+
+def to_primitive(value: Any) -> Any:
+    """
+    Приводит ORM объекты, строки запросов и схемы к типам JSON
+    :param value:
+    :return: value
+    """
+    if isinstance(value, UUID):
+        # asyncpg отдает собственный подкласс UUID, который orjson не знает
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode='json')
+    if isinstance(value, Row):
+        return value._asdict()
+    if isinstance(value, Base):
+        parents = parent_relationships(type(value))
+        return {
+            key: item
+            for key, item in vars(value).items()
+            if not key.startswith('_') and key not in parents
+        }
+    raise TypeError(f'Type is not cacheable: {type(value).__name__}')
+
+
+def schema_render(schema: Any) -> Callable[[Any], bytes]:
+    """
+    Готовое тело ответа: проверка и сериализация схемой ответа,
+    как это делает FastAPI для response_model
+    :param schema:
+    :return: render
+    """
+    adapter = TypeAdapter(schema)
+
+    def render(value: Any) -> bytes:
+        return adapter.dump_json(adapter.validate_python(value, from_attributes=True))
+
+    return render
+
+
+def passthrough(body: bytes) -> bytes:
+    """Тело уже собрано в JSON, например самой базой"""
+    return body
+
+
+@cache
+def parent_relationships(model: type[Base]) -> frozenset[str]:
+    """Обратные ссылки на родителя дали бы цикл menu -> submenu -> menu"""
+    return frozenset(
+        rel.key for rel in inspect(model).relationships if rel.direction is MANYTOONE
+    )
+
+
+orjson_codec = OrjsonCodec()
@@ -11,17 +11,53 @@ PREFIX_LINK = 'http://main_app:8000/api/v1'
 MENUS_LINK = '/menus'
 MENU_LINK = '/menus/{menu_id}'
 SUBMENUS_LINK = '/menus/{menu_id}/submenus'
+SUBMENUS_BULK_LINK = '/menus/{menu_id}/submenus/bulk'
 SUBMENU_LINK = '/menus/{menu_id}/submenus/{submenu_id}'
 DISHES_LINK = '/menus/{menu_id}/submenus/{submenu_id}/dishes'
+DISHES_BULK_LINK = '/menus/{menu_id}/submenus/{submenu_id}/dishes/bulk'
 DISH_LINK = '/menus/{menu_id}/submenus/{submenu_id}/dishes/{dish_id}'
+FULL_BASE_KEY = 'full_base_menu'
+GENERATION = '{name}:generation'
+STALE_WARNING = '110 - "Response is Stale"'
 MENU_FILE_LINK = '/food_app/admin/Menu.xlsx'
 
+MENU_TAG = 'tags:menus:{menu_id}'
+SUBMENU_TAG = 'tags:submenus:{submenu_id}'
+# Все закэшированные страницы одного списка
+PAGES_TAG = 'tags:pages:{link}'
+
 DB_NAME = os.environ.get('DB_NAME')
 DB_USER = os.environ.get('DB_USER')
 DB_PASS = os.environ.get('DB_PASS')
 DB_HOST = os.environ.get('DB_HOST')
 DB_PORT = os.environ.get('DB_PORT')
+
+# Пул соединений на один воркер: pool_size + max_overflow, умноженные на
+# число воркеров, должны помещаться в max_connections Postgres
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 5))
+DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW', 10))
+DB_POOL_TIMEOUT = float(os.environ.get('DB_POOL_TIMEOUT', 30))
+DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE', -1))
+DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'false').lower() in ('1', 'true', 'yes')
+# 0 отключает кэш подготовленных выражений asyncpg (нужно за pgbouncer)
+DB_STATEMENT_CACHE_SIZE = int(os.environ.get('DB_STATEMENT_CACHE_SIZE', 100))
 db_url = f'postgresql+asyncpg://{DB_USER}:{DB_PASS}@{DB_HOST}:{DB_PORT}/{DB_NAME}'
+# Реплики только для чтения: полные URL через запятую
+replica_urls = [url for url in os.environ.get('DB_REPLICA_URLS', '').split(',') if url]
+# Столько секунд после своей записи клиент читает с основной базы,
+# чтобы отстающая реплика не вернула ему старые данные
+LAST_WRITE_COOKIE = 'last_write'
+READ_YOUR_WRITES_WINDOW = float(os.environ.get('READ_YOUR_WRITES_WINDOW', 5))
+
+# Сервер: асинхронному воркеру хватает одного процесса на ядро
+SERVER_HOST = os.environ.get('SERVER_HOST', '0.0.0.0')
+SERVER_PORT = int(os.environ.get('SERVER_PORT', 8000))
+SERVER_WORKERS = int(os.environ.get('WEB_CONCURRENCY', os.cpu_count() or 1))
+SERVER_KEEP_ALIVE = int(os.environ.get('SERVER_KEEP_ALIVE', 5))
+SERVER_BACKLOG = int(os.environ.get('SERVER_BACKLOG', 2048))
+SERVER_TIMEOUT = int(os.environ.get('SERVER_TIMEOUT', 60))
+SERVER_GRACEFUL_TIMEOUT = int(os.environ.get('SERVER_GRACEFUL_TIMEOUT', 30))
+SERVER_RELOAD = os.environ.get('SERVER_RELOAD', 'false').lower() in ('1', 'true', 'yes')
 
 REDIS_HOST = os.environ.get('REDIS_HOST')
 REDIS_PORT = os.environ.get('REDIS_PORT')
@@ -34,6 +70,23 @@ RABBITMQ_HOST = os.environ.get('RABBITMQ_HOST')
 CELERY_STATUS = os.environ.get('CELERY_STATUS')
 
 EXPIRATION = 3600
+EXPIRATION_JITTER = 300
+# Снимок /all_base не удаляется при записи, а помечается устаревшим
+STALE_EXPIRATION = 86400
+CACHE_LOCK_TIMEOUT = 5
+CACHE_LOCK_WAIT = 0.05
+CACHE_LOCK_RETRIES = 40
+LOCAL_EXPIRATION = 60
+LOCAL_CACHE_SIZE = 1024
+INVALIDATION_CHANNEL = 'cache:invalidation'
+PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+# Строк в одном массовом INSERT: 6 параметров на блюдо при лимите 32767 у Postgres
+BULK_MAX_SIZE = 1000
+# Сколько ключей прогрев кэша загружает одновременно
+WARMUP_CONCURRENCY = 8
+# Меняется при изменении формы закэшированных MenuOut/SubMenuOut/DishOut и /all_base
+CACHE_VERSION = 2
 
 DB_NAME_TEST = os.environ.get('DB_NAME_TEST')
 DB_USER_TEST = os.environ.get('DB_USER_TEST')
@@ -1,18 +1,182 @@
-from settings.config import db_url
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from itertools import cycle
+from time import perf_counter, time
+from typing import Any, Sequence
+
+from fastapi import Request
+from settings.config import (
+    DB_MAX_OVERFLOW,
+    DB_POOL_PRE_PING,
+    DB_POOL_RECYCLE,
+    DB_POOL_SIZE,
+    DB_POOL_TIMEOUT,
+    DB_STATEMENT_CACHE_SIZE,
+    LAST_WRITE_COOKIE,
+    READ_YOUR_WRITES_WINDOW,
+    db_url,
+    replica_urls,
+)
+from sqlalchemy import AsyncAdaptedQueuePool
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from utils.metrics import metrics
+
+
+class TimedQueuePool(AsyncAdaptedQueuePool):
+    """Пул, который замеряет ожидание соединения при выдаче"""
+
+    name = 'main'
+
+    def _do_get(self) -> Any:
+        started = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            metrics.observe('db_pool_wait_seconds', perf_counter() - started, pool=self.name)
+
+    def recreate(self) -> 'TimedQueuePool':
+        pool = super().recreate()
+        pool.name = self.name
+        return pool
+
+
+def wrote_recently(request: Request) -> bool:
+    """Клиент писал в базу за последние READ_YOUR_WRITES_WINDOW секунд"""
+    try:
+        last_write = float(request.cookies.get(LAST_WRITE_COOKIE, ''))
+    except ValueError:
+        return False
+    return time() - last_write < READ_YOUR_WRITES_WINDOW
 
 
 class DataBase:
-    def __init__(self, url: str) -> None:
-        self._engine = create_async_engine(url=url, echo=False)
-        self._session_fabric = async_sessionmaker(
-            bind=self._engine, autoflush=False, autocommit=False, expire_on_commit=False
+    """
+    Основная база и реплики. Движки создаются в connect() на старте
+    приложения и закрываются в dispose() при остановке
+    """
+
+    def __init__(
+        self,
+        url: str,
+        replica_urls: Sequence[str] = (),
+        name: str = 'main',
+        pool_size: int = DB_POOL_SIZE,
+        max_overflow: int = DB_MAX_OVERFLOW,
+        pool_timeout: float = DB_POOL_TIMEOUT,
+        pool_recycle: int = DB_POOL_RECYCLE,
+        pool_pre_ping: bool = DB_POOL_PRE_PING,
+        statement_cache_size: int = DB_STATEMENT_CACHE_SIZE,
+    ) -> None:
+        self.name = name
+        self.url = url
+        self.replica_urls = tuple(replica_urls)
+        self._pool_options = {
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': pool_timeout,
+            'pool_recycle': pool_recycle,
+            'pool_pre_ping': pool_pre_ping,
+            'connect_args': {
+                'prepared_statement_cache_size': statement_cache_size,
+                'statement_cache_size': statement_cache_size,
+            },
+        }
+        self._engines: dict[str, AsyncEngine] = {}
+        self._session_fabric: async_sessionmaker[AsyncSession] | None = None
+        self._replicas: list[async_sessionmaker[AsyncSession]] = []
+        self._next_replica = cycle(self._replicas)
+
+    @property
+    def connected(self) -> bool:
+        return self._session_fabric is not None
+
+    def connect(self) -> None:
+        if self.connected:
+            return
+        self._session_fabric = self._make_session_fabric(
+            self._make_engine(self.url, self.name)
         )
+        self._replicas = [
+            self._make_session_fabric(
+                self._make_engine(replica_url, f'{self.name}-replica-{index}')
+            )
+            for index, replica_url in enumerate(self.replica_urls)
+        ]
+        self._next_replica = cycle(self._replicas)
+
+    async def dispose(self) -> None:
+        """Закрывает соединения пулов, выданные сессиями вернутся и закроются"""
+        engines = list(self._engines.values())
+        self._engines.clear()
+        self._session_fabric = None
+        self._replicas = []
+        self._next_replica = cycle(self._replicas)
+        for engine in engines:
+            await engine.dispose()
+
+    def _make_engine(self, url: str, name: str) -> AsyncEngine:
+        engine = create_async_engine(
+            url=url, echo=False, poolclass=TimedQueuePool, **self._pool_options
+        )
+        engine.pool.name = name
+        self._engines[name] = engine
+        for stat in ('size', 'checked_out', 'overflow'):
+            metrics.gauge(
+                f'db_pool_{stat}', lambda stat=stat: self.pool_stats(name)[stat], pool=name
+            )
+        return engine
+
+    @staticmethod
+    def _make_session_fabric(engine: AsyncEngine) -> async_sessionmaker[AsyncSession]:
+        return async_sessionmaker(
+            bind=engine, autoflush=False, autocommit=False, expire_on_commit=False
+        )
+
+    def session_factory(self) -> async_sessionmaker[AsyncSession]:
+        if self._session_fabric is None:
+            raise RuntimeError(f'Database {self.name} is not connected')
+        return self._session_fabric
 
     async def scoped_session(self) -> AsyncSession:
-        async with self._session_fabric() as session:
+        async with self.session_factory()() as session:
             yield session
             await session.close()
 
+    def read_session_factory(self, request: Request) -> async_sessionmaker[AsyncSession]:
+        """
+        Фабрика сессий для чтения: реплики по кругу, но основная база,
+        если реплик нет или клиент недавно писал сам
+        :param request:
+        :return: session maker
+        """
+        if not self._replicas or wrote_recently(request):
+            return self.session_factory()
+        return next(self._next_replica)
+
+    async def read_session(self, request: Request) -> AsyncSession:
+        async with self.read_session_factory(request)() as session:
+            yield session
+            await session.close()
+
+    def pool_stats(self, name: str | None = None) -> dict[str, int]:
+        """
+        Состояние пула: размер, выданные соединения и переполнение сверх
+        pool_size. Время ожидания копится в гистограмме db_pool_wait_seconds
+        :param name: пул основной базы по умолчанию
+        :return: stats
+        """
+        engine = self._engines.get(name or self.name)
+        if engine is None:
+            return {'size': 0, 'checked_out': 0, 'overflow': 0}
+        pool = engine.pool
+        return {
+            'size': pool.size(),
+            'checked_out': pool.checkedout(),
+            'overflow': max(pool.overflow(), 0),
+        }
+
 
-vortex = DataBase(db_url)
+vortex = DataBase(db_url, replica_urls)
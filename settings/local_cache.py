@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from time import monotonic
+from typing import Any, Iterable, NamedTuple
+
+
+class LocalItem(NamedTuple):
+    expires: float
+    value: Any
+    tags: tuple[str, ...]
+
+
+class LocalCache:
+    """Ограниченный LRU кэш внутри процесса с TTL и тегами как в Redis"""
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: OrderedDict[str, LocalItem] = OrderedDict()
+        self._tags: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key: str) -> Any | None:
+        item = self._items.get(key)
+        if item is None:
+            return None
+        if item.expires < monotonic():
+            self.discard(key)
+            return None
+        self._items.move_to_end(key)
+        return item.value
+
+    def set(self, key: str, value: Any, *tags: str) -> None:
+        self.discard(key)
+        self._items[key] = LocalItem(monotonic() + self.ttl, value, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        while len(self._items) > self.maxsize:
+            self.discard(next(iter(self._items)))
+
+    def discard(self, *keys: str) -> None:
+        for key in keys:
+            item = self._items.pop(key, None)
+            if item is None:
+                continue
+            for tag in item.tags:
+                members = self._tags.get(tag)
+                if members is not None:
+                    members.discard(key)
+                    if not members:
+                        del self._tags[tag]
+
+    def discard_tags(self, tags: Iterable[str]) -> None:
+        for tag in tags:
+            self.discard(*self._tags.pop(tag, ()))
+
+    def clear(self) -> None:
+        self._items.clear()
+        self._tags.clear()
@@ -4,3 +4,4 @@ from .base import Base
 from .dish import Dish
 from .submenu import SubMenu
 from .menu import Menu
+from . import counters  # noqa: F401  триггеры счетчиков для create_all
@@ -0,0 +1,147 @@
+"""
+Счетчики submenus_count/dishes_count поддерживаются триггерами уровня
+выражения с таблицами переходов: вставка, удаление и каскад из
+одного выражения дают одно обновление на родителя, а не на строку.
+Блюда меняют submenu.dishes_count, а уже изменения подменю
+переносятся в menu.submenus_count и menu.dishes_count
+"""
+from settings.models.base import Base
+from sqlalchemy import DDL, event
+
+SUBMENU_COUNTERS = """
+CREATE OR REPLACE FUNCTION submenu_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE menu
+        SET submenus_count = menu.submenus_count + delta.submenus,
+            dishes_count = menu.dishes_count + delta.dishes
+        FROM (
+            SELECT menu_id, count(*) AS submenus, sum(dishes_count) AS dishes
+            FROM new_rows GROUP BY menu_id
+        ) AS delta
+        WHERE menu.id = delta.menu_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE menu
+        SET submenus_count = menu.submenus_count - delta.submenus,
+            dishes_count = menu.dishes_count - delta.dishes
+        FROM (
+            SELECT menu_id, count(*) AS submenus, sum(dishes_count) AS dishes
+            FROM old_rows GROUP BY menu_id
+        ) AS delta
+        WHERE menu.id = delta.menu_id;
+    ELSE
+        UPDATE menu
+        SET submenus_count = menu.submenus_count + delta.submenus,
+            dishes_count = menu.dishes_count + delta.dishes
+        FROM (
+            SELECT menu_id, sum(submenus) AS submenus, sum(dishes) AS dishes
+            FROM (
+                SELECT menu_id, 1 AS submenus, dishes_count AS dishes FROM new_rows
+                UNION ALL
+                SELECT menu_id, -1, -dishes_count FROM old_rows
+            ) AS changes
+            GROUP BY menu_id
+        ) AS delta
+        WHERE menu.id = delta.menu_id
+            AND (delta.submenus <> 0 OR delta.dishes <> 0);
+    END IF;
+    RETURN NULL;
+END $$
+"""
+
+DISH_COUNTERS = """
+CREATE OR REPLACE FUNCTION dish_counters() RETURNS trigger
+LANGUAGE plpgsql AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE submenu
+        SET dishes_count = submenu.dishes_count + delta.dishes
+        FROM (
+            SELECT submenu_id, count(*) AS dishes FROM new_rows GROUP BY submenu_id
+        ) AS delta
+        WHERE submenu.id = delta.submenu_id;
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE submenu
+        SET dishes_count = submenu.dishes_count - delta.dishes
+        FROM (
+            SELECT submenu_id, count(*) AS dishes FROM old_rows GROUP BY submenu_id
+        ) AS delta
+        WHERE submenu.id = delta.submenu_id;
+    ELSE
+        UPDATE submenu
+        SET dishes_count = submenu.dishes_count + delta.dishes
+        FROM (
+            SELECT submenu_id, sum(dishes) AS dishes
+            FROM (
+                SELECT submenu_id, 1 AS dishes FROM new_rows
+                UNION ALL
+                SELECT submenu_id, -1 FROM old_rows
+            ) AS changes
+            GROUP BY submenu_id
+        ) AS delta
+        WHERE submenu.id = delta.submenu_id AND delta.dishes <> 0;
+    END IF;
+    RETURN NULL;
+END $$
+"""
+
+# Таблицы переходов, доступные функции счетчиков для каждого события
+TRANSITION_TABLES = {
+    'INSERT': 'NEW TABLE AS new_rows',
+    'UPDATE': 'OLD TABLE AS old_rows NEW TABLE AS new_rows',
+    'DELETE': 'OLD TABLE AS old_rows',
+}
+
+
+def counter_triggers(table: str) -> tuple[str, ...]:
+    return tuple(
+        f'CREATE OR REPLACE TRIGGER {table}_counters_{event_name.lower()} '
+        f'AFTER {event_name} ON {table} REFERENCING {transition} '
+        f'FOR EACH STATEMENT EXECUTE FUNCTION {table}_counters()'
+        for event_name, transition in TRANSITION_TABLES.items()
+    )
+
+
+# По одной команде на выражение: asyncpg не выполняет несколько команд разом
+COUNTER_DDL = (
+    SUBMENU_COUNTERS,
+    DISH_COUNTERS,
+    *counter_triggers('submenu'),
+    *counter_triggers('dish'),
+)
+
+# Пересчет с нуля: сначала подменю, затем меню по уже исправленным подменю
+RECOUNT_SUBMENUS = """
+UPDATE submenu
+SET dishes_count = counted.dishes
+FROM (
+    SELECT submenu.id, count(dish.id) AS dishes
+    FROM submenu LEFT JOIN dish ON dish.submenu_id = submenu.id
+    GROUP BY submenu.id
+) AS counted
+WHERE submenu.id = counted.id AND submenu.dishes_count <> counted.dishes
+RETURNING submenu.menu_id
+"""
+
+RECOUNT_MENUS = """
+UPDATE menu
+SET submenus_count = counted.submenus, dishes_count = counted.dishes
+FROM (
+    SELECT menu.id,
+        count(submenu.id) AS submenus,
+        coalesce(sum(submenu.dishes_count), 0) AS dishes
+    FROM menu LEFT JOIN submenu ON submenu.menu_id = menu.id
+    GROUP BY menu.id
+) AS counted
+WHERE menu.id = counted.id
+    AND (menu.submenus_count, menu.dishes_count)
+        <> (counted.submenus, counted.dishes)
+RETURNING menu.id
+"""
+
+# create_all (тесты) создает триггеры так же, как миграция
+for statement in COUNTER_DDL:
+    event.listen(
+        Base.metadata, 'after_create', DDL(statement).execute_if(dialect='postgresql')
+    )
@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 from uuid import UUID
 
 from settings.models.base import Base
-from sqlalchemy import ForeignKey, Integer, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, Relationship, mapped_column
 
 if TYPE_CHECKING:
@@ -11,6 +11,8 @@ if TYPE_CHECKING:
 
 class Dish(Base):
     __tablename__ = 'dish'
+    # Блюда подменю, страницы по id и каскадное удаление подменю
+    __table_args__ = (Index('ix_dish_submenu_id_id', 'submenu_id', 'id'),)
 
     title: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
     description: Mapped[str] = mapped_column(Text, nullable=True)
@@ -1,7 +1,7 @@
 from typing import TYPE_CHECKING
 
 from settings.models.base import Base
-from sqlalchemy import String, Text
+from sqlalchemy import Integer, String, Text
 from sqlalchemy.orm import Mapped, Relationship, mapped_column
 
 if TYPE_CHECKING:
@@ -13,8 +13,15 @@ class Menu(Base):
 
     title: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
     description: Mapped[str] = mapped_column(Text, nullable=True)
+    # Поддерживаются триггерами, см. settings/models/counters.py
+    submenus_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default='0'
+    )
+    dishes_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default='0'
+    )
 
-    submenu_link: Mapped['SubMenu'] = Relationship(
+    submenu_link: Mapped[list['SubMenu']] = Relationship(
         'SubMenu',
         back_populates='menu_link',
         cascade='all, delete-orphan',
@@ -2,7 +2,7 @@ from typing import TYPE_CHECKING
 from uuid import UUID
 
 from settings.models.base import Base
-from sqlalchemy import ForeignKey, String, Text
+from sqlalchemy import ForeignKey, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, Relationship, mapped_column
 
 if TYPE_CHECKING:
@@ -12,19 +12,25 @@ if TYPE_CHECKING:
 
 class SubMenu(Base):
     __tablename__ = 'submenu'
+    # Подменю меню, страницы по id и каскадное удаление меню
+    __table_args__ = (Index('ix_submenu_menu_id_id', 'menu_id', 'id'),)
 
     title: Mapped[str] = mapped_column(String(50), nullable=False, unique=True)
     description: Mapped[str] = mapped_column(Text, nullable=True)
+    # Поддерживается триггерами, см. settings/models/counters.py
+    dishes_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default='0'
+    )
 
     menu_id: Mapped[UUID] = mapped_column(
-        ForeignKey('menu.id', ondelete='CASCADE'), unique=True, nullable=True
+        ForeignKey('menu.id', ondelete='CASCADE'), nullable=True
     )
     menu_link: Mapped['Menu'] = Relationship(
         'Menu',
         back_populates='submenu_link',
     )
 
-    dishes: Mapped['Dish'] = Relationship(
+    dishes: Mapped[list['Dish']] = Relationship(
         'Dish',
         back_populates='position',
         cascade='all, delete-orphan',
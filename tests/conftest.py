@@ -20,6 +20,10 @@ async def override_scoped_session() -> AsyncGenerator[AsyncSession, None]:
 
 
 app.dependency_overrides[vortex.scoped_session] = override_scoped_session
+app.dependency_overrides[vortex.read_session] = override_scoped_session
+app.dependency_overrides[vortex.session_factory] = (
+    lambda: test_database.test_session_maker
+)
 
 
 @pytest_asyncio.fixture(autouse=True, scope='session')
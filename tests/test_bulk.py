@@ -0,0 +1,100 @@
+from http import HTTPStatus
+from uuid import uuid4
+
+from api.v1.dishes.views import create_dishes, show_dishes
+from api.v1.menu.views import create_menu, delete_menu, get_full_menu, get_menu
+from api.v1.submenu.views import create_submenus, show_submenus
+from httpx import AsyncClient
+from settings.test_database import test_database
+from sqlalchemy import event
+from tests.utils import reverse
+
+
+async def test_bulk_create_submenus_and_dishes(
+    client: AsyncClient, menu_post: dict[str, str]
+) -> None:
+    menu = (
+        await client.post(reverse(create_menu), json={**menu_post, 'title': 'Bulk menu'})
+    ).json()
+    submenus = [{'title': f'Bulk submenu {number}'} for number in range(3)]
+    response = await client.post(
+        reverse(create_submenus, menu_id=menu['id']), json=submenus
+    )
+    assert response.status_code == HTTPStatus.CREATED
+    assert [item['title'] for item in response.json()] == [
+        item['title'] for item in submenus
+    ]
+    submenu = response.json()[0]
+
+    dishes = [
+        {'title': f'Bulk dish {number}', 'price': f'{number}.00'} for number in range(5)
+    ]
+    statements = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    engine = test_database.test_engine.sync_engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = await client.post(
+            reverse(create_dishes, menu_id=menu['id'], submenu_id=submenu['id']),
+            json=dishes,
+        )
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert response.status_code == HTTPStatus.CREATED
+    assert len(response.json()) == 5
+    assert [statement.split()[0] for statement in statements] == ['INSERT']
+
+    response = await client.get(reverse(get_menu, menu_id=menu['id']))
+    assert response.json()['submenus_count'] == 3
+    assert response.json()['dishes_count'] == 5
+    response = await client.get(
+        reverse(show_dishes, menu_id=menu['id'], submenu_id=submenu['id'])
+    )
+    assert len(response.json()) == 5
+    response = await client.get(reverse(show_submenus, menu_id=menu['id']))
+    assert response.json()[0]['title'].startswith('Bulk submenu')
+
+    await client.get(reverse(get_full_menu))
+    full = (await client.get(reverse(get_full_menu))).json()
+    bulk_menu = next(item for item in full if item['id'] == menu['id'])
+    assert len(bulk_menu['submenu_link']) == 3
+
+    await client.delete(reverse(delete_menu, menu_id=menu['id']))
+
+
+async def test_bulk_create_rejects_bad_batches(
+    client: AsyncClient, menu_post: dict[str, str]
+) -> None:
+    menu = (
+        await client.post(reverse(create_menu), json={**menu_post, 'title': 'Bulk menu'})
+    ).json()
+    submenu = (
+        await client.post(
+            reverse(create_submenus, menu_id=menu['id']), json=[{'title': 'Bulk'}]
+        )
+    ).json()[0]
+    url = reverse(create_dishes, menu_id=menu['id'], submenu_id=submenu['id'])
+
+    response = await client.post(url, json=[])
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    dish = {'title': 'Twice', 'price': '1.00'}
+    response = await client.post(url, json=[dish, dish])
+    assert response.status_code == HTTPStatus.BAD_REQUEST
+    response = await client.get(reverse(get_menu, menu_id=menu['id']))
+    assert response.json()['dishes_count'] == 0
+
+    response = await client.post(
+        reverse(create_dishes, menu_id=menu['id'], submenu_id=uuid4()), json=[dish]
+    )
+    assert response.json()['detail'] == 'submenu not found'
+    response = await client.post(
+        reverse(create_submenus, menu_id=uuid4()), json=[{'title': 'Orphan'}]
+    )
+    assert response.json()['detail'] == 'menu not found'
+
+    await client.delete(reverse(delete_menu, menu_id=menu['id']))
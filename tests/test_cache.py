@@ -0,0 +1,311 @@
+import asyncio
+from contextlib import suppress
+from uuid import uuid4
+
+from api.v1.menu.schemas import MenuOut
+from fastapi import BackgroundTasks
+from settings.cache import RedisCache, page_key, pages_tag, redis_cache
+from settings.codec import orjson_codec, schema_render
+from settings.config import (
+    CACHE_VERSION,
+    DISH_LINK,
+    DISHES_LINK,
+    FULL_BASE_KEY,
+    MENU_LINK,
+    MENU_TAG,
+    MENUS_LINK,
+    SUBMENU_LINK,
+    SUBMENU_TAG,
+)
+from settings.local_cache import LocalCache
+from settings.models import Dish
+from utils.metrics import metrics, namespace
+
+
+async def exists(*names: str) -> int:
+    return await redis_cache.cache_maker.exists(*map(redis_cache.key, names))
+
+
+async def test_delete_menu_tag_drops_subtree() -> None:
+    menu_id, submenu_id, other_menu_id = uuid4(), uuid4(), uuid4()
+    await redis_cache.create_update_menu_cache({'id': menu_id})
+    await redis_cache.set_submenu_cache({'id': submenu_id}, menu_id=menu_id)
+    await redis_cache.set_dish_cache(
+        {'id': uuid4()}, submenu_id=submenu_id, menu_id=menu_id
+    )
+    await redis_cache.create_update_menu_cache({'id': other_menu_id})
+
+    await redis_cache.delete_tags_cache(MENU_TAG.format(menu_id=menu_id))
+
+    assert await redis_cache.get_menu_cache(menu_id) is None
+    assert await redis_cache.get_submenu_cache(submenu_id, menu_id) is None
+    assert await redis_cache.get_menu_cache(other_menu_id) is not None
+    assert not await exists(MENU_TAG.format(menu_id=menu_id))
+    await redis_cache.delete_tags_cache(MENU_TAG.format(menu_id=other_menu_id))
+
+
+async def test_delete_submenu_tag_keeps_menu() -> None:
+    menu_id, submenu_id, dish_id = uuid4(), uuid4(), uuid4()
+    await redis_cache.create_update_menu_cache({'id': menu_id})
+    await redis_cache.set_dish_cache(
+        {'id': dish_id}, submenu_id=submenu_id, menu_id=menu_id
+    )
+
+    await redis_cache.delete_tags_cache(SUBMENU_TAG.format(submenu_id=submenu_id))
+
+    assert not await exists(
+        DISH_LINK.format(menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id),
+        SUBMENU_LINK.format(menu_id=menu_id, submenu_id=submenu_id),
+    )
+    assert await exists(MENU_LINK.format(menu_id=menu_id))
+    await redis_cache.delete_tags_cache(MENU_TAG.format(menu_id=menu_id))
+
+
+async def test_batch_flushes_deletes_and_sets_together() -> None:
+    menu_id, submenu_id, dish_id = uuid4(), uuid4(), uuid4()
+    dish_link = DISH_LINK.format(
+        menu_id=menu_id, submenu_id=submenu_id, dish_id=dish_id
+    )
+    await redis_cache.create_update_menu_cache({'id': menu_id})
+    await redis_cache.write(MENUS_LINK, b'[]')
+    await redis_cache.write(FULL_BASE_KEY, b'[]')
+
+    async with redis_cache.batch() as batch:
+        batch.delete_tags(MENU_TAG.format(menu_id=menu_id))
+        batch.delete(MENUS_LINK, FULL_BASE_KEY)
+        batch.set(dish_link, b'{}', MENU_TAG.format(menu_id=menu_id))
+        assert await exists(MENUS_LINK)
+
+    assert not await exists(MENU_LINK.format(menu_id=menu_id), MENUS_LINK, FULL_BASE_KEY)
+    assert await redis_cache.cache_maker.sismember(
+        redis_cache.key(MENU_TAG.format(menu_id=menu_id)),
+        redis_cache.key(dish_link),
+    )
+    await redis_cache.delete_tags_cache(MENU_TAG.format(menu_id=menu_id))
+
+
+async def test_codec_stores_versioned_json_shape() -> None:
+    submenu_id = uuid4()
+    dish = Dish(id=uuid4(), title='Dish', price='1.50', submenu_id=submenu_id)
+
+    await redis_cache.write(MENUS_LINK, redis_cache.encode([dish]))
+
+    raw = await redis_cache.cache_maker.get(f'json:v{CACHE_VERSION}:{MENUS_LINK}')
+    assert raw == orjson_codec.encode([dish])
+    assert orjson_codec.decode(await redis_cache.get_all_menus_cache()) == [
+        {
+            'id': str(dish.id),
+            'title': 'Dish',
+            'price': '1.50',
+            'submenu_id': str(submenu_id),
+        }
+    ]
+    await redis_cache.unlink(MENUS_LINK)
+
+
+async def test_response_rendered_once_per_version() -> None:
+    menu_id = uuid4()
+    renders = []
+    render_menu = schema_render(MenuOut)
+
+    def render(value: dict) -> bytes:
+        renders.append(value)
+        return render_menu(value)
+
+    async def loader() -> dict:
+        return {'id': menu_id, 'title': 'Menu', 'extra': 'dropped'}
+
+    first = await redis_cache.get_menu_cache(menu_id, loader=loader, render=render)
+    redis_cache.local.clear()
+    second = await redis_cache.get_menu_cache(menu_id, loader=loader, render=render)
+
+    assert len(renders) == 1
+    assert first == second
+    assert orjson_codec.decode(first) == {
+        'title': 'Menu',
+        'description': None,
+        'id': str(menu_id),
+        'submenus_count': 0,
+        'dishes_count': 0,
+    }
+    await redis_cache.delete_menu_cache(menu_id)
+
+
+def test_local_cache_evicts_lru_and_expired() -> None:
+    local = LocalCache(maxsize=2, ttl=60)
+    local.set('a', 1, 'tag')
+    local.set('b', 2)
+    local.get('a')
+    local.set('c', 3)
+
+    assert local.get('b') is None
+    assert local.get('a') == 1
+
+    local.discard_tags(['tag'])
+    assert local.get('a') is None
+
+    local.ttl = -1
+    local.set('d', 4)
+    assert local.get('d') is None
+
+
+async def test_local_cache_serves_repeated_reads() -> None:
+    menu_id = uuid4()
+    await redis_cache.create_update_menu_cache({'id': menu_id})
+    assert await redis_cache.get_menu_cache(menu_id) is not None
+
+    await redis_cache.cache_maker.delete(
+        redis_cache.key(MENU_LINK.format(menu_id=menu_id))
+    )
+
+    assert await redis_cache.get_menu_cache(menu_id) is not None
+    await redis_cache.delete_tags_cache(MENU_TAG.format(menu_id=menu_id))
+    assert await redis_cache.get_menu_cache(menu_id) is None
+
+
+async def test_local_cache_dropped_by_other_worker() -> None:
+    menu_id = uuid4()
+    await redis_cache.create_update_menu_cache({'id': menu_id})
+    listener = asyncio.create_task(redis_cache.listen_invalidations())
+    await asyncio.sleep(0.1)
+    assert await redis_cache.get_menu_cache(menu_id) is not None
+
+    await RedisCache().delete_menu_cache(menu_id)
+    await asyncio.sleep(0.1)
+
+    assert redis_cache.local.get(MENU_LINK.format(menu_id=menu_id)) is None
+    listener.cancel()
+    with suppress(asyncio.CancelledError):
+        await listener
+
+
+async def test_read_through_loads_once_and_populates() -> None:
+    menu_id = uuid4()
+    calls = []
+
+    async def loader() -> dict:
+        calls.append(menu_id)
+        return {'id': menu_id, 'title': 'Menu'}
+
+    first = await redis_cache.get_menu_cache(menu_id, loader=loader)
+    redis_cache.local.clear()
+    second = await redis_cache.get_menu_cache(menu_id, loader=loader)
+
+    assert len(calls) == 1
+    assert first == second
+    assert orjson_codec.decode(second) == {'id': str(menu_id), 'title': 'Menu'}
+    assert await exists(MENU_LINK.format(menu_id=menu_id))
+    await redis_cache.delete_menu_cache(menu_id)
+
+
+async def test_concurrent_misses_share_one_load() -> None:
+    menu_id = uuid4()
+    calls = []
+
+    async def loader() -> dict:
+        calls.append(menu_id)
+        await asyncio.sleep(0.05)
+        return {'id': menu_id}
+
+    results = await asyncio.gather(
+        *(redis_cache.get_menu_cache(menu_id, loader=loader) for _ in range(10))
+    )
+
+    assert len(calls) == 1
+    assert all(result == orjson_codec.encode({'id': menu_id}) for result in results)
+    await redis_cache.delete_menu_cache(menu_id)
+
+
+async def test_miss_waits_for_other_worker_loader() -> None:
+    menu_id = uuid4()
+    name = MENU_LINK.format(menu_id=menu_id)
+    await redis_cache.cache_maker.set(redis_cache.key(f'lock:{name}'), 'other', ex=5)
+
+    async def other_worker() -> None:
+        await asyncio.sleep(0.1)
+        await RedisCache().write(name, orjson_codec.encode({'id': menu_id}))
+
+    async def loader() -> dict:
+        raise AssertionError('loaded twice')
+
+    result, _ = await asyncio.gather(
+        redis_cache.get_menu_cache(menu_id, loader=loader), other_worker()
+    )
+
+    assert orjson_codec.decode(result) == {'id': str(menu_id)}
+    await redis_cache.cache_maker.delete(redis_cache.key(f'lock:{name}'))
+    await redis_cache.delete_menu_cache(menu_id)
+
+
+async def test_full_base_served_stale_while_revalidating() -> None:
+    versions = [[{'title': 'old'}], [{'title': 'new'}]]
+    tasks = BackgroundTasks()
+
+    async def loader() -> list[dict]:
+        return versions.pop(0)
+
+    await redis_cache.unlink(FULL_BASE_KEY)
+    assert await redis_cache.get_full_base_menu_cache(loader, tasks) == (
+        b'[{"title":"old"}]',
+        False,
+    )
+    async with redis_cache.batch() as batch:
+        batch.mark_stale(FULL_BASE_KEY)
+
+    assert await redis_cache.get_full_base_menu_cache(loader, tasks) == (
+        b'[{"title":"old"}]',
+        True,
+    )
+    assert versions == [[{'title': 'new'}]]
+
+    await tasks()
+    assert await redis_cache.get_full_base_menu_cache(loader, tasks) == (
+        b'[{"title":"new"}]',
+        False,
+    )
+    await redis_cache.unlink(FULL_BASE_KEY)
+
+
+async def test_metrics_count_hits_misses_and_sets() -> None:
+    menu_id = uuid4()
+    space = namespace(MENU_LINK.format(menu_id=menu_id))
+    metrics.clear()
+
+    async def loader() -> dict:
+        return {'id': menu_id}
+
+    for _ in range(3):
+        await redis_cache.get_menu_cache(menu_id, loader=loader)
+    await redis_cache.delete_menu_cache(menu_id)
+
+    assert space == '/menus/{id}'
+    assert metrics.value('cache_misses_total', namespace=space) == 1
+    assert metrics.value('cache_sets_total', namespace=space) == 1
+    assert metrics.value('cache_hits_total', namespace=space, tier='local') == 1
+    assert metrics.value('cache_hits_total', namespace=space, tier='redis') == 1
+    assert metrics.value('cache_read_bytes_total', namespace=space) == len(
+        orjson_codec.encode({'id': menu_id})
+    )
+    assert metrics.value('cache_invalidations_total', namespace='/menus') == 1
+    assert metrics.histograms['cache_latency_seconds'][
+        (('namespace', space), ('op', 'load'))
+    ].count == 1
+
+
+async def test_update_dish_drops_every_cached_page() -> None:
+    menu_id, submenu_id = uuid4(), uuid4()
+
+    async def loader() -> list:
+        return []
+
+    for after in (None, uuid4()):
+        await redis_cache.get_all_dishes_cache(
+            menu_id, submenu_id, limit=10, after=after, loader=loader
+        )
+    link = DISHES_LINK.format(menu_id=menu_id, submenu_id=submenu_id)
+    assert len(await redis_cache.cache_maker.smembers(redis_cache.key(pages_tag(link)))) == 2
+
+    await redis_cache.update_dish_cache({'id': uuid4()}, menu_id, submenu_id)
+
+    assert not await exists(pages_tag(link), page_key(link, 10, None))
+    await redis_cache.delete_menu_cache(menu_id)
@@ -2,7 +2,13 @@ from http import HTTPStatus
 from typing import Any
 
 from api.v1.dishes.views import create_dish, show_dishes
-from api.v1.menu.views import create_menu, delete_menu, get_menu, show_menus
+from api.v1.menu.views import (
+    create_menu,
+    delete_menu,
+    get_menu,
+    show_menus,
+    update_menu,
+)
 from api.v1.submenu.views import (
     create_submenu,
     delete_submenu,
@@ -10,6 +16,8 @@ from api.v1.submenu.views import (
     show_submenus,
 )
 from httpx import AsyncClient
+from settings.test_database import test_database
+from sqlalchemy import event
 from tests.utils import reverse
 
 
@@ -125,6 +133,81 @@ async def test_get_current_submenu(
     assert response.json()['dishes_count'] == 2
 
 
+async def test_lists_include_counts(
+    saved_data: dict[str, Any],
+    client: AsyncClient,
+) -> None:
+    menu = saved_data['menu']
+    submenu = saved_data['submenu']
+    response = await client.get(reverse(show_menus))
+    assert response.status_code == HTTPStatus.OK
+    [listed_menu] = [item for item in response.json() if item['id'] == menu['id']]
+    assert listed_menu['submenus_count'] == 1
+    assert listed_menu['dishes_count'] == 2
+
+    response = await client.get(reverse(show_submenus, menu_id=menu['id']))
+    assert response.status_code == HTTPStatus.OK
+    [listed_submenu] = [
+        item for item in response.json() if item['id'] == submenu['id']
+    ]
+    assert listed_submenu['dishes_count'] == 2
+
+
+
+
+async def test_dishes_keyset_pages(
+    saved_data: dict[str, Any],
+    client: AsyncClient,
+) -> None:
+    menu = saved_data['menu']
+    submenu = saved_data['submenu']
+    url = reverse(show_dishes, menu_id=menu['id'], submenu_id=submenu['id'])
+    expected = sorted([saved_data['dish_1']['id'], saved_data['dish_2']['id']])
+
+    pages, after = [], None
+    for _ in range(3):
+        params = {'limit': 1} | ({'after': after} if after else {})
+        response = await client.get(url, params=params)
+        assert response.status_code == HTTPStatus.OK
+        pages.append([item['id'] for item in response.json()])
+        after = pages[-1][-1] if pages[-1] else None
+
+    assert pages == [expected[:1], expected[1:], []]
+
+    response = await client.get(url, params={'limit': 0})
+    assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+
+async def test_update_menu_returns_counts_in_one_statement(
+    menu_patch: dict[str, str],
+    saved_data: dict[str, Any],
+    client: AsyncClient,
+) -> None:
+    menu = saved_data['menu']
+    statements = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    engine = test_database.test_engine.sync_engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = await client.patch(
+            reverse(update_menu, menu_id=menu['id']), json=menu_patch
+        )
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    assert response.status_code == HTTPStatus.OK
+    assert response.json()['submenus_count'] == 1
+    assert response.json()['dishes_count'] == 2
+    # Пустой RETURNING означает 404, отдельной проверки существования нет
+    assert len(statements) == 1
+    assert statements[0].startswith('UPDATE menu')
+
+    saved_data['menu'] = response.json()
+
+
 async def test_delete_submenu(
     saved_data: dict[str, Any],
     client: AsyncClient,
@@ -0,0 +1,74 @@
+from uuid import UUID, uuid4
+
+from settings.models import Dish, Menu, SubMenu
+from settings.test_database import test_database
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from utils.recount import recount
+
+
+async def counts(
+    session: AsyncSession, menu_id: UUID, submenu_id: UUID | None
+) -> tuple[int, int, int | None]:
+    menu = (
+        await session.execute(
+            select(Menu.submenus_count, Menu.dishes_count).where(Menu.id == menu_id)
+        )
+    ).one()
+    submenu = await session.scalar(
+        select(SubMenu.dishes_count).where(SubMenu.id == submenu_id)
+    )
+    return menu.submenus_count, menu.dishes_count, submenu
+
+
+async def test_triggers_follow_inserts_deletes_and_cascade() -> None:
+    menu_id, submenu_id = uuid4(), uuid4()
+    async with test_database.test_session_maker() as session:
+        session.add(Menu(id=menu_id, title='Counted menu'))
+        await session.flush()
+        session.add(SubMenu(id=submenu_id, title='Counted submenu', menu_id=menu_id))
+        await session.flush()
+        session.add_all(
+            [
+                Dish(title=f'Counted dish {number}', price='1.00', submenu_id=submenu_id)
+                for number in range(3)
+            ]
+        )
+        await session.commit()
+        assert await counts(session, menu_id, submenu_id) == (1, 3, 3)
+
+        await session.execute(delete(Dish).where(Dish.title == 'Counted dish 0'))
+        await session.commit()
+        assert await counts(session, menu_id, submenu_id) == (1, 2, 2)
+
+        await session.execute(delete(SubMenu).where(SubMenu.id == submenu_id))
+        await session.commit()
+        assert await counts(session, menu_id, None) == (0, 0, None)
+
+        await session.execute(delete(Menu).where(Menu.id == menu_id))
+        await session.commit()
+
+
+async def test_recount_repairs_drifted_counters() -> None:
+    menu_id, submenu_id = uuid4(), uuid4()
+    async with test_database.test_session_maker() as session:
+        session.add(Menu(id=menu_id, title='Drifted menu'))
+        await session.flush()
+        session.add(SubMenu(id=submenu_id, title='Drifted submenu', menu_id=menu_id))
+        await session.flush()
+        session.add(Dish(title='Drifted dish', price='1.00', submenu_id=submenu_id))
+        await session.commit()
+        await session.execute(
+            update(Menu).where(Menu.id == menu_id).values(submenus_count=7, dishes_count=7)
+        )
+        await session.execute(
+            update(SubMenu).where(SubMenu.id == submenu_id).values(dishes_count=7)
+        )
+        await session.commit()
+
+        assert await recount(session) == {menu_id}
+        assert await counts(session, menu_id, submenu_id) == (1, 1, 1)
+        assert await recount(session) == set()
+
+        await session.execute(delete(Menu).where(Menu.id == menu_id))
+        await session.commit()
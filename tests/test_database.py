@@ -0,0 +1,96 @@
+import asyncio
+from time import time
+
+from api.v1.menu.views import create_menu, delete_menu, show_menus
+from fastapi import Request
+from httpx import AsyncClient
+from settings.config import LAST_WRITE_COOKIE, test_db_url
+from runner import app, lifespan
+from settings.database import DataBase, vortex
+from sqlalchemy import text
+from tests.utils import reverse
+from utils.metrics import metrics
+from utils.middleware import InFlightRequests, in_flight
+
+
+def request_with(cookies: dict[str, str]) -> Request:
+    cookie = '; '.join(f'{name}={value}' for name, value in cookies.items())
+    return Request({'type': 'http', 'headers': [(b'cookie', cookie.encode())]})
+
+
+async def test_pool_reports_checkouts_and_wait_time() -> None:
+    database = DataBase(
+        test_db_url, name='test', pool_size=1, max_overflow=1, statement_cache_size=0
+    )
+    database.connect()
+    metrics.clear()
+    assert database.pool_stats() == {'size': 1, 'checked_out': 0, 'overflow': 0}
+
+    async with database.session_factory()() as first, database.session_factory()() as second:
+        await first.execute(text('SELECT 1'))
+        await second.execute(text('SELECT 1'))
+        assert database.pool_stats() == {'size': 1, 'checked_out': 2, 'overflow': 1}
+        assert metrics.gauges['db_pool_checked_out'][(('pool', 'test'),)]() == 2
+
+    assert database.pool_stats()['checked_out'] == 0
+    assert metrics.histograms['db_pool_wait_seconds'][(('pool', 'test'),)].count == 2
+    await database.dispose()
+
+
+async def test_reads_go_to_replica_unless_client_wrote_recently() -> None:
+    database = DataBase(test_db_url, [test_db_url], name='routed')
+    database.connect()
+
+    replica = database.read_session_factory(request_with({}))
+    async with replica() as session:
+        assert await session.scalar(text('SELECT 1')) == 1
+
+    assert replica is not database.session_factory()
+    assert database.pool_stats('routed-replica-0')['size'] == database.pool_stats()['size']
+    assert database.read_session_factory(
+        request_with({LAST_WRITE_COOKIE: str(time())})
+    ) is database.session_factory()
+    assert database.read_session_factory(
+        request_with({LAST_WRITE_COOKIE: str(time() - 60)})
+    ) is replica
+    await database.dispose()
+
+
+async def test_writes_set_last_write_cookie(
+    client: AsyncClient, menu_post: dict[str, str]
+) -> None:
+    read = await client.get(reverse(show_menus))
+    assert LAST_WRITE_COOKIE not in read.cookies
+
+    created = await client.post(reverse(create_menu), json=menu_post)
+    assert time() - float(created.cookies[LAST_WRITE_COOKIE]) < 5
+
+    await client.delete(reverse(delete_menu, menu_id=created.json()['id']))
+    client.cookies.clear()
+
+
+async def test_lifespan_connects_and_drains_before_dispose() -> None:
+    assert not vortex.connected
+    finished = []
+
+    async def slow_request() -> None:
+        with in_flight:
+            await asyncio.sleep(0.1)
+            finished.append(vortex.connected)
+
+    async with lifespan(app):
+        assert vortex.connected
+        request = asyncio.create_task(slow_request())
+        await asyncio.sleep(0)
+
+    await request
+    assert finished == [True]
+    assert not vortex.connected
+    assert app.state.ready is False
+
+
+async def test_drain_gives_up_after_timeout() -> None:
+    requests = InFlightRequests()
+    with requests:
+        assert not await requests.drain(0.01)
+    assert await requests.drain(0.01)
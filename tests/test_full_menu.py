@@ -5,6 +5,9 @@ from api.v1.dishes.views import create_dish, delete_dish
 from api.v1.menu.views import create_menu, delete_menu, get_full_menu
 from api.v1.submenu.views import delete_submenu, show_submenus
 from httpx import AsyncClient
+from settings.config import STALE_WARNING
+from settings.test_database import test_database
+from sqlalchemy import event
 from tests.utils import reverse
 
 
@@ -79,10 +82,43 @@ async def test_full_base(
     saved_data: dict[str, Any],
     client: AsyncClient,
 ) -> None:
+    statements = []
+
+    def record(conn, cursor, statement, *args) -> None:
+        statements.append(statement)
+
+    engine = test_database.test_engine.sync_engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        response = await client.get(
+            reverse(get_full_menu),
+        )
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+    assert response.status_code == HTTPStatus.OK
+    # Дерево целиком собирает один запрос с json_agg
+    assert len(statements) == 1
+
     response = await client.get(
         reverse(get_full_menu),
     )
-    assert response.status_code == HTTPStatus.OK
+    assert response.json() == [
+        {
+            **saved_data['menu'],
+            'submenus_count': 1,
+            'dishes_count': 1,
+            'submenu_link': [
+                {
+                    **saved_data['submenu'],
+                    'menu_id': saved_data['menu']['id'],
+                    'dishes_count': 1,
+                    'dishes': [
+                        {**saved_data['dish'], 'submenu_id': saved_data['submenu']['id']}
+                    ],
+                }
+            ],
+        }
+    ]
 
 
 async def test_delete_dish(
@@ -154,4 +190,11 @@ async def test_full_base_after_menu_delete(client: AsyncClient) -> None:
         reverse(get_full_menu),
     )
     assert response.status_code == HTTPStatus.OK
+    assert response.headers['Warning'] == STALE_WARNING
+
+    response = await client.get(
+        reverse(get_full_menu),
+    )
+    assert response.status_code == HTTPStatus.OK
+    assert 'Warning' not in response.headers
     assert response.json() == []
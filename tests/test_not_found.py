@@ -0,0 +1,58 @@
+from http import HTTPStatus
+from uuid import uuid4
+
+from api.v1.dishes.views import create_dish, delete_dish, update_dish
+from api.v1.menu.views import create_menu, delete_menu, update_menu
+from api.v1.submenu.views import create_submenu, delete_submenu, update_submenu
+from httpx import AsyncClient
+from tests.utils import reverse
+
+
+async def test_mutations_of_missing_rows_return_404(
+    client: AsyncClient,
+    menu_patch: dict[str, str],
+    submenu_patch: dict[str, str],
+    dish_patch: dict[str, str],
+) -> None:
+    ids = {'menu_id': uuid4(), 'submenu_id': uuid4(), 'dish_id': uuid4()}
+    cases = [
+        ('patch', update_menu, menu_patch, 'menu not found'),
+        ('delete', delete_menu, None, 'menu not found'),
+        ('patch', update_submenu, submenu_patch, 'submenu not found'),
+        ('delete', delete_submenu, None, 'submenu not found'),
+        ('patch', update_dish, dish_patch, 'dish not found'),
+        ('delete', delete_dish, None, 'dish not found'),
+    ]
+    for method, view, body, detail in cases:
+        kwargs = {'json': body} if body else {}
+        response = await client.request(method, reverse(view, **ids), **kwargs)
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert response.json()['detail'] == detail
+
+
+async def test_create_under_missing_parent_returns_404(
+    client: AsyncClient,
+    menu_post: dict[str, str],
+    submenu_post: dict[str, str],
+    dish_post: dict[str, str],
+) -> None:
+    response = await client.post(
+        reverse(create_submenu, menu_id=uuid4()), json=submenu_post
+    )
+    assert response.json()['detail'] == 'menu not found'
+
+    response = await client.post(
+        reverse(create_dish, menu_id=uuid4(), submenu_id=uuid4()), json=dish_post
+    )
+    assert response.json()['detail'] == 'menu not found'
+
+    menu = (
+        await client.post(reverse(create_menu), json={**menu_post, 'title': 'Orphans'})
+    ).json()
+    response = await client.post(
+        reverse(create_dish, menu_id=menu['id'], submenu_id=uuid4()), json=dish_post
+    )
+    assert response.status_code == HTTPStatus.NOT_FOUND
+    assert response.json()['detail'] == 'submenu not found'
+
+    await client.delete(reverse(delete_menu, menu_id=menu['id']))
@@ -0,0 +1,154 @@
+import json
+from typing import Any, Awaitable, Callable
+from uuid import UUID, uuid4
+
+from api.v1.dishes import crud as dish_crud
+from api.v1.dishes.schemas import DishIn
+from api.v1.menu import crud as menu_crud
+from api.v1.menu.schemas import MenuIn
+from api.v1.submenu import crud as submenu_crud
+from api.v1.submenu.schemas import SubMenuIn
+from settings.test_database import test_database
+from sqlalchemy import event, text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+MENUS, SUBMENUS, DISHES = 50, 40, 5
+# Таблицы, которые растут с данными: полный проход по ним запрещен
+LARGE_TABLES = {'submenu', 'dish'}
+
+SEED = (
+    f"""
+    INSERT INTO menu (id, title)
+    SELECT gen_random_uuid(), 'Plan menu ' || number
+    FROM generate_series(1, {MENUS}) AS number
+    """,
+    f"""
+    INSERT INTO submenu (id, title, menu_id)
+    SELECT gen_random_uuid(), menu.title || ' submenu ' || number, menu.id
+    FROM menu, generate_series(1, {SUBMENUS}) AS number
+    WHERE menu.title LIKE 'Plan menu %'
+    """,
+    f"""
+    INSERT INTO dish (id, title, price, submenu_id)
+    SELECT gen_random_uuid(), submenu.title || ' dish ' || number, '1.00', submenu.id
+    FROM submenu, generate_series(1, {DISHES}) AS number
+    WHERE submenu.title LIKE 'Plan menu %'
+    """,
+    'ANALYZE menu',
+    'ANALYZE submenu',
+    'ANALYZE dish',
+)
+
+
+def seq_scans(plan: dict[str, Any]) -> list[str]:
+    found = []
+    if plan['Node Type'] == 'Seq Scan' and plan['Relation Name'] in LARGE_TABLES:
+        found.append(plan['Relation Name'])
+    for child in plan.get('Plans', ()):
+        found.extend(seq_scans(child))
+    return found
+
+
+async def explain_calls(
+    call: Callable[[AsyncSession], Awaitable[Any]]
+) -> list[tuple[str, list[str]]]:
+    """Выполняет функцию crud и возвращает seq scan'ы планов всех ее запросов"""
+    statements = []
+
+    def record(conn, cursor, statement, parameters, *args) -> None:
+        if not statement.startswith('EXPLAIN'):
+            statements.append((statement, parameters))
+
+    engine = test_database.test_engine.sync_engine
+    event.listen(engine, 'before_cursor_execute', record)
+    try:
+        async with test_database.test_session_maker() as session:
+            await call(session)
+    finally:
+        event.remove(engine, 'before_cursor_execute', record)
+
+    plans = []
+    async with test_database.test_engine.connect() as conn:
+        for statement, parameters in statements:
+            result = await conn.exec_driver_sql(
+                f'EXPLAIN (FORMAT JSON) {statement}', tuple(parameters)
+            )
+            plan = result.scalar()
+            plan = json.loads(plan) if isinstance(plan, str) else plan
+            plans.append((statement, seq_scans(plan[0]['Plan'])))
+    return plans
+
+
+async def seed() -> dict[str, UUID]:
+    async with test_database.test_engine.begin() as conn:
+        for statement in SEED:
+            await conn.execute(text(statement))
+        row = (
+            await conn.execute(
+                text(
+                    """
+                    SELECT menu.id AS menu_id, submenu.id AS submenu_id, dish.id AS dish_id
+                    FROM menu
+                    JOIN submenu ON submenu.menu_id = menu.id
+                    JOIN dish ON dish.submenu_id = submenu.id
+                    WHERE menu.title = 'Plan menu 1'
+                    ORDER BY submenu.id, dish.id
+                    LIMIT 1
+                    """
+                )
+            )
+        ).one()
+    return row._asdict()
+
+
+def crud_calls(ids: dict[str, UUID]) -> dict[str, Callable[[AsyncSession], Awaitable]]:
+    menu_id, submenu_id, dish_id = ids['menu_id'], ids['submenu_id'], ids['dish_id']
+    dish = DishIn(title='Plan probe dish', price='1.00')
+    submenu = SubMenuIn(title='Plan probe submenu')
+    return {
+        'add_menu': lambda s: menu_crud.add_menu(s, MenuIn(title='Plan probe menu')),
+        'show_menu': lambda s: menu_crud.show_menu(menu_id, s),
+        'get_all_menus': lambda s: menu_crud.get_all_menus(s),
+        'change_menu': lambda s: menu_crud.change_menu(
+            menu_id, MenuIn(title='Plan renamed menu'), s
+        ),
+        'all_menu_data': lambda s: menu_crud.all_menu_data(s),
+        'add_submenu': lambda s: submenu_crud.add_submenu(s, submenu, menu_id),
+        'add_submenus': lambda s: submenu_crud.add_submenus(
+            s, [SubMenuIn(title='Plan probe submenu 2')], menu_id
+        ),
+        'show_submenu': lambda s: submenu_crud.show_submenu(submenu_id, s),
+        'get_all_submenus': lambda s: submenu_crud.get_all_submenus(
+            menu_id, s, limit=5, after=uuid4()
+        ),
+        'change_submenu': lambda s: submenu_crud.change_submenu(
+            menu_id, submenu_id, SubMenuIn(title='Plan renamed submenu'), s
+        ),
+        'add_dish': lambda s: dish_crud.add_dish(dish, s, menu_id, submenu_id),
+        'add_dishes': lambda s: dish_crud.add_dishes(
+            [DishIn(title='Plan probe dish 2', price='1.00')], s, menu_id, submenu_id
+        ),
+        'show_dish': lambda s: dish_crud.show_dish(dish_id, s),
+        'get_all_dish': lambda s: dish_crud.get_all_dish(
+            submenu_id, s, limit=5, after=uuid4()
+        ),
+        'change_dish': lambda s: dish_crud.change_dish(
+            dish_id, DishIn(title='Plan renamed dish', price='2.00'), s
+        ),
+        'drop_dish': lambda s: dish_crud.drop_dish(dish_id, s),
+        'drop_submenu': lambda s: submenu_crud.drop_submenu(submenu_id, s),
+        'drop_menu': lambda s: menu_crud.drop_menu(menu_id, s),
+    }
+
+
+async def test_crud_queries_do_not_scan_large_tables() -> None:
+    failures = {}
+    try:
+        for name, call in crud_calls(await seed()).items():
+            for statement, scans in await explain_calls(call):
+                if scans:
+                    failures[name] = scans
+    finally:
+        async with test_database.test_engine.begin() as conn:
+            await conn.execute(text("DELETE FROM menu WHERE title LIKE 'Plan%'"))
+    assert failures == {}
@@ -0,0 +1,50 @@
+from http import HTTPStatus
+
+from api.v1.menu.views import create_menu, delete_menu
+from api.v1.submenu.views import show_submenus
+from httpx import AsyncClient
+from runner import app, ready
+from settings.cache import page_key, redis_cache
+from settings.config import (
+    FULL_BASE_KEY,
+    MENU_LINK,
+    MENUS_LINK,
+    PAGE_SIZE,
+    SUBMENUS_LINK,
+)
+from settings.test_database import test_database
+from tests.utils import reverse
+from utils.warmup import warm_up_cache
+
+
+async def test_warm_up_fills_cold_cache(
+    menu_post: dict[str, str],
+    submenu_post: dict[str, str],
+    client: AsyncClient,
+) -> None:
+    menu = (await client.post(reverse(create_menu), json=menu_post)).json()
+    await client.post(reverse(show_submenus, menu_id=menu['id']), json=submenu_post)
+    names = (
+        MENUS_LINK,
+        MENU_LINK.format(menu_id=menu['id']),
+        page_key(SUBMENUS_LINK.format(menu_id=menu['id']), PAGE_SIZE, None),
+        FULL_BASE_KEY,
+    )
+    await redis_cache.unlink(*names)
+
+    counts = await warm_up_cache(test_database.test_session_maker)
+
+    assert counts == {'menus': 1, 'menu': 1, 'submenus': 1, 'full_base': 1}
+    assert await redis_cache.cache_maker.exists(*map(redis_cache.key, names)) == 4
+    await client.delete(reverse(delete_menu, menu_id=menu['id']))
+
+
+async def test_ready_after_warm_up(client: AsyncClient) -> None:
+    app.state.ready = False
+    response = await client.get(reverse(ready))
+    assert response.status_code == HTTPStatus.SERVICE_UNAVAILABLE
+
+    app.state.ready = True
+    response = await client.get(reverse(ready))
+    assert response.status_code == HTTPStatus.OK
+    assert response.json() == {'ready': True}
@@ -0,0 +1,85 @@
+import re
+from bisect import bisect_left
+from contextlib import contextmanager
+from functools import lru_cache
+from time import perf_counter
+from typing import Callable, Iterator
+
+# Границы корзин гистограмм задержки, в секундах
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+UUID_PATTERN = re.compile(
+    r'[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}', re.IGNORECASE
+)
+
+Labels = tuple[tuple[str, str], ...]
+
+
+@lru_cache(maxsize=4096)
+def namespace(name: str) -> str:
+    """
+    Пространство имен ключа кэша: идентификаторы заменяются на {id},
+    чтобы число меток не росло вместе с числом записей
+    :param name:
+    :return: namespace
+    """
+    return UUID_PATTERN.sub('{id}', name)
+
+
+class Histogram:
+    """Гистограмма с фиксированными корзинами, как в Prometheus"""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Счетчики, гистограммы и датчики процесса с метками"""
+
+    def __init__(self) -> None:
+        self.counters: dict[str, dict[Labels, float]] = {}
+        self.histograms: dict[str, dict[Labels, Histogram]] = {}
+        self.gauges: dict[str, dict[Labels, Callable[[], float]]] = {}
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        series = self.counters.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        series[key] = series.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        series = self.histograms.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        histogram = series.get(key)
+        if histogram is None:
+            histogram = series[key] = Histogram()
+        histogram.observe(value)
+
+    def gauge(self, name: str, read: Callable[[], float], **labels: str) -> None:
+        """Датчик читает текущее значение в момент сбора метрик"""
+        self.gauges.setdefault(name, {})[tuple(sorted(labels.items()))] = read
+
+    @contextmanager
+    def timer(self, name: str, **labels: str) -> Iterator[None]:
+        started = perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, perf_counter() - started, **labels)
+
+    def value(self, name: str, **labels: str) -> float:
+        return self.counters.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def clear(self) -> None:
+        self.counters.clear()
+        self.histograms.clear()
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,81 @@
+import asyncio
+from math import ceil
+from time import time
+
+from settings.config import LAST_WRITE_COOKIE, READ_YOUR_WRITES_WINDOW
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+SAFE_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS'))
+
+
+class InFlightRequests:
+    """Счетчик запросов в обработке, фоновые задачи ответа входят в запрос"""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def __enter__(self) -> None:
+        self.count += 1
+        self.idle.clear()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.count -= 1
+        if not self.count:
+            self.idle.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Ждет завершения текущих запросов, False если не успели за timeout"""
+        try:
+            await asyncio.wait_for(self.idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+
+in_flight = InFlightRequests()
+
+
+class DrainMiddleware:
+    """Учитывает каждый HTTP запрос в in_flight до конца его фоновых задач"""
+
+    def __init__(self, app: ASGIApp, requests: InFlightRequests = in_flight) -> None:
+        self.app = app
+        self.requests = requests
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http':
+            await self.app(scope, receive, send)
+            return
+        with self.requests:
+            await self.app(scope, receive, send)
+
+
+class ReadYourWritesMiddleware:
+    """
+    Ставит cookie со временем успешной записи. Пока она жива,
+    vortex.read_session читает за этого клиента с основной базы
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.cookie = (
+            f'{LAST_WRITE_COOKIE}={{}}; Max-Age={ceil(READ_YOUR_WRITES_WINDOW)}; '
+            'Path=/; HttpOnly; SameSite=lax'
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope['type'] != 'http' or scope['method'] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_cookie(message: Message) -> None:
+            if message['type'] == 'http.response.start' and message['status'] < 400:
+                MutableHeaders(scope=message).append(
+                    'set-cookie', self.cookie.format(f'{time():.3f}')
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_cookie)
@@ -0,0 +1,50 @@
+"""
+Пересчет денормализованных submenus_count/dishes_count с нуля,
+если счетчики разошлись с данными (ручные правки, отключенные триггеры).
+
+Запуск из корня проекта:
+    python -m utils.recount
+"""
+import asyncio
+from uuid import UUID
+
+from settings.cache import menu_tags, redis_cache
+from settings.config import FULL_BASE_KEY, MENUS_LINK
+from settings.database import vortex
+from settings.models.counters import RECOUNT_MENUS, RECOUNT_SUBMENUS
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def recount(session: AsyncSession) -> set[UUID]:
+    """
+    Исправляет счетчики под блокировкой от записи и сбрасывает кэш
+    затронутых меню
+    :param session:
+    :return: id меню, у которых менялись счетчики
+    """
+    await session.execute(text('LOCK TABLE menu, submenu, dish IN SHARE ROW EXCLUSIVE MODE'))
+    submenus = await session.execute(text(RECOUNT_SUBMENUS))
+    menu_ids = set(submenus.scalars())
+    menus = await session.execute(text(RECOUNT_MENUS))
+    menu_ids.update(menus.scalars())
+    menu_ids.discard(None)
+    await session.commit()
+    if menu_ids:
+        async with redis_cache.batch() as batch:
+            batch.delete_tags(*(tag for menu_id in menu_ids for tag in menu_tags(menu_id)))
+            batch.delete(MENUS_LINK)
+            batch.mark_stale(FULL_BASE_KEY)
+    return menu_ids
+
+
+async def main() -> None:
+    vortex.connect()
+    async with vortex.session_factory()() as session:
+        menu_ids = await recount(session)
+    await vortex.dispose()
+    print(f'Counters repaired for {len(menu_ids)} menus')
+
+
+if __name__ == '__main__':
+    asyncio.run(main())
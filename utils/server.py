@@ -0,0 +1,7 @@
+from uvicorn.workers import UvicornWorker
+
+
+class ProductionWorker(UvicornWorker):
+    """Воркер gunicorn на uvloop и httptools вместо asyncio и h11"""
+
+    CONFIG_KWARGS = {'loop': 'uvloop', 'http': 'httptools'}
@@ -2,48 +2,33 @@ from uuid import UUID
 
 import aioredis
 from aioredis import Redis
+from asyncpg import ForeignKeyViolationError
+from fastapi import Response
 from settings.config import REDIS_HOST, REDIS_PORT
 from settings.models import Dish, Menu, SubMenu
-from sqlalchemy import Result, func, select
+from sqlalchemy import exists, select
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
-async def submenu_count(menu_id: UUID, session: AsyncSession) -> int | Result:
-    result = (
-        select(func.count()).select_from(SubMenu).filter(SubMenu.menu_id == menu_id)
-    )
-    stmt = await session.execute(result)
-    answer: Result | None = stmt.scalar_one_or_none()
-    if answer:
-        return answer
-    return 0
-
-
-async def dishes_count(submenu_id: UUID, session: AsyncSession) -> int:
-    dish_id = select(Menu).where(Menu.id == submenu_id)
-    total: Result = await session.execute(dish_id)
-    final = total.scalar_one_or_none()
-    if final:
-        menu_id = final.id
-        stmt = select(SubMenu.dishes).where(SubMenu.menu_id == menu_id)
-        result = await session.execute(stmt)
-        answer = result.all()
-        return len(answer)
-    stmt = select(SubMenu.dishes).where(SubMenu.id == submenu_id)
-    result = await session.execute(stmt)
-    answer = result.all()
-    return len(answer)
-
-
 async def data_finder(
     table: type[Menu] | type[SubMenu] | type[Dish],
     table_id: UUID,
     session: AsyncSession,
-) -> Menu | None:
-    stmt = select(table).where(table.id == table_id)
-    result = await session.execute(stmt)
-    answer = result.scalar_one_or_none()
-    return answer
+) -> bool:
+    """Проверка существования записи, нужна только для текста ошибки"""
+    stmt = select(exists().where(table.id == table_id))
+    return bool(await session.scalar(stmt))
+
+
+def foreign_key_violation(error: IntegrityError) -> bool:
+    """Вставка сослалась на родителя, которого нет"""
+    return getattr(error.orig, 'sqlstate', None) == ForeignKeyViolationError.sqlstate
+
+
+def json_response(body: bytes, headers: dict[str, str] | None = None) -> Response:
+    """Готовое тело из кэша отдается без повторной проверки response_model"""
+    return Response(content=body, media_type='application/json', headers=headers)
 
 
 def redis_maker() -> aioredis.ConnectionPool:
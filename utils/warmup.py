@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from collections import Counter
+from functools import partial
+from time import perf_counter
+from typing import Any, Awaitable, Callable
+
+from api.v1.menu.service import MenuService
+from api.v1.submenu.service import SubMenuService
+from fastapi import BackgroundTasks
+from settings.base_exception import BaseAPIException
+from settings.config import WARMUP_CONCURRENCY
+from settings.models import Menu
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up_cache(
+    session_factory: async_sessionmaker[AsyncSession],
+) -> Counter[str]:
+    """
+    Заполняет кэш /menus, каждого меню, списков подменю и /all_base
+    до прихода трафика. Ключи загружаются через те же сервисы,
+    что и в запросах, не больше WARMUP_CONCURRENCY одновременно
+    :param session_factory:
+    :return: число прогретых ключей по видам
+    """
+    started = perf_counter()
+    semaphore = asyncio.Semaphore(WARMUP_CONCURRENCY)
+    menus, submenus = MenuService(), SubMenuService()
+    counts: Counter[str] = Counter()
+
+    async def warm(kind: str, load: Callable[..., Awaitable[Any]]) -> None:
+        async with semaphore, session_factory() as session:
+            try:
+                await load(session=session)
+            except BaseAPIException:
+                # Запись удалили после того, как был прочитан список меню
+                return
+        counts[kind] += 1
+
+    async def warm_full_base() -> None:
+        async with semaphore:
+            background_task = BackgroundTasks()
+            await menus.get_full_service(
+                session_factory=session_factory, background_task=background_task
+            )
+            # Устаревший снимок пересобирается сразу, а не после ответа
+            await background_task()
+        counts['full_base'] += 1
+
+    async with session_factory() as session:
+        menu_ids = (await session.scalars(select(Menu.id))).all()
+
+    await asyncio.gather(
+        warm('menus', menus.get_all_menu_service),
+        warm_full_base(),
+        *(
+            warm('menu', partial(menus.get_menu_service, title=menu_id))
+            for menu_id in menu_ids
+        ),
+        *(
+            warm('submenus', partial(submenus.get_all_submenus_service, menu_id=menu_id))
+            for menu_id in menu_ids
+        ),
+    )
+    logger.info(
+        'Cache warm-up finished in %.2fs: %d keys %s',
+        perf_counter() - started,
+        counts.total(),
+        dict(counts),
+    )
+    return counts